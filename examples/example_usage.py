@@ -1,31 +1,34 @@
+import os
+
 from b3_msh.core.airfoil import Airfoil
 from b3_msh.core.shear_web import ShearWeb
 from b3_msh.utils.logger import get_logger
 
 logger = get_logger(__name__)
+fast = bool(os.environ.get("B3_MSH_FAST"))
 
 # Load NACA0018 from file
 af = Airfoil.from_xfoil("examples/naca0018.dat")
 
-# Add shear web with refinement
-sw = ShearWeb(
-    {"type": "plane", "origin": (0.5, 0, 0), "normal": (1, 0, 0), "name": "spar"}
-)
-af.add_shear_web(sw, refinement_factor=2.0)
-
-# Add trailing edge shear web
-sw_te = ShearWeb({"type": "trailing_edge"})
-af.add_shear_web(sw_te)
+# Add all shear webs, then remesh once with total points
+with af.deferred_remesh(total_n_points=100):
+    # Add shear web with refinement
+    sw = ShearWeb(
+        {"type": "plane", "origin": (0.5, 0, 0), "normal": (1, 0, 0), "name": "spar"}
+    )
+    af.add_shear_web(sw, refinement_factor=2.0)
 
-# Add shear web with n_elements
-sw_mesh = ShearWeb({"type": "plane", "origin": (0.3, 0.05, 0), "normal": (1, 0, 0)})
-af.add_shear_web(sw_mesh, n_elements=10)
+    # Add trailing edge shear web
+    sw_te = ShearWeb({"type": "trailing_edge"})
+    af.add_shear_web(sw_te)
 
-# Remesh with total points, using shear web refinement
-af.remesh(total_n_points=100)
+    # Add shear web with n_elements
+    sw_mesh = ShearWeb({"type": "plane", "origin": (0.3, 0.05, 0), "normal": (1, 0, 0)})
+    af.add_shear_web(sw_mesh, n_elements=10)
 
 # Plot
-af.plot(show_hard_points=True, save_path="airfoil.png")
+if not fast:
+    af.plot(show_hard_points=True, save_path="airfoil.png")
 
 # Export to PyVista
 mesh = af.to_pyvista()
@@ -33,16 +36,18 @@ logger.info(f"Mesh has {mesh.n_points} points and {mesh.n_cells} cells")
 logger.info(f"Point data keys: {list(mesh.point_data.keys())}")
 
 # Write to VTP
-mesh.save("output.vtp")
-logger.info("Mesh saved to output.vtp")
+if not fast:
+    mesh.save("output.vtp")
+    logger.info("Mesh saved to output.vtp")
 
 # Example with NACA0018 from file and hard points at t=0.3 and t=0.7
 af_naca = Airfoil.from_xfoil("examples/naca0018.dat")
-af_naca.add_hard_point(0.3)
-af_naca.add_hard_point(0.7)
 # af_naca.remesh(total_n_points=50)
-af_naca.remesh(n_elements_per_panel=[12, 25, 5])
-af_naca.plot(show_hard_points=True, save_path="airfoil_naca.png")
+with af_naca.deferred_remesh(n_elements_per_panel=[12, 25, 5]):
+    af_naca.add_hard_point(0.3)
+    af_naca.add_hard_point(0.7)
+if not fast:
+    af_naca.plot(show_hard_points=True, save_path="airfoil_naca.png")
 
 # Example with meshed shear webs
 logger.info("Shear webs are included in the mesh and plot above.")
@@ -1,34 +1,39 @@
+import os
+
 from b3_msh.core.airfoil import Airfoil
 from b3_msh.core.shear_web import ShearWeb
 from b3_msh.utils.logger import get_logger
 
 logger = get_logger(__name__)
+fast = bool(os.environ.get("B3_MSH_FAST"))
 
 # Load NACA0018 airfoil
 af = Airfoil.from_xfoil("examples/naca0018.dat")
 
-# Add hard points to create panels
-af.add_hard_point(0.3)
-af.add_hard_point(0.7)
+# Remesh with explicit number of elements per panel using dict
+# Key is panel_id (0-based index), value is n_elements
+n_elements_dict = {0: 10, 1: 20, 2: 15}
+
+# Add hard points to create panels, the remesh runs once at the end
+with af.deferred_remesh(n_elements_per_panel=n_elements_dict):
+    af.add_hard_point(0.3)
+    af.add_hard_point(0.7)
 
 # Now there are 3 panels: 0-0.3, 0.3-0.7, 0.7-1.0
 panels = af.get_panels()
 print(f"Panels: {panels}")
 
-# Remesh with explicit number of elements per panel using dict
-# Key is panel_id (0-based index), value is n_elements
-n_elements_dict = {0: 10, 1: 20, 2: 15}
-af.remesh(n_elements_per_panel=n_elements_dict)
-
 logger.info(f"Total points after remesh: {len(af.current_points)}")
 
 # Plot the airfoil with hard points
-af.plot(show_hard_points=True, save_path="explicit_n_elements_airfoil.png")
+if not fast:
+    af.plot(show_hard_points=True, save_path="explicit_n_elements_airfoil.png")
 
 # Export to PyVista
 mesh = af.to_pyvista()
-mesh.save("explicit_n_elements_output.vtp")
-logger.info(f"Mesh saved with {mesh.n_points} points and {mesh.n_cells} cells")
+if not fast:
+    mesh.save("explicit_n_elements_output.vtp")
+    logger.info(f"Mesh saved with {mesh.n_points} points and {mesh.n_cells} cells")
 logger.info(f"Point data keys: {list(mesh.point_data.keys())}")
 
 # Optionally, add a shear web and remesh again
@@ -52,11 +57,13 @@ n_elements_dict_new = {0: 10, 1: 15, 2: 20, 3: 10}  # Example
 if len(panels_after) == len(n_elements_dict_new):
     af.remesh(n_elements_per_panel=n_elements_dict_new)
     logger.info(f"Remeshed with shear web, total points: {len(af.current_points)}")
-    af.plot(show_hard_points=True, save_path="explicit_n_elements_with_web.png")
     mesh2 = af.to_pyvista()
-    mesh2.save("explicit_n_elements_with_web.vtp")
-    logger.info(
-        f"Mesh with web saved with {mesh2.n_points} points and {mesh2.n_cells} cells"
-    )
+    if not fast:
+        af.plot(show_hard_points=True, save_path="explicit_n_elements_with_web.png")
+        mesh2.save("explicit_n_elements_with_web.vtp")
+        logger.info(
+            f"Mesh with web saved with {mesh2.n_points} points "
+            f"and {mesh2.n_cells} cells"
+        )
 else:
     logger.warning("Adjust n_elements_dict to match number of panels")
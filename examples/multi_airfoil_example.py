@@ -1,5 +1,7 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
-import copy
 from b3_msh.core.airfoil import Airfoil
 from b3_msh.core.shear_web import ShearWeb
 from b3_msh.utils.utils import process_airfoils_parallel
@@ -7,6 +9,7 @@ import pyvista as pv
 from b3_msh.utils.logger import get_logger
 
 logger = get_logger(__name__)
+fast = bool(os.environ.get("B3_MSH_FAST"))
 
 
 # Function to process each airfoil: add shear web and remesh
@@ -20,15 +23,16 @@ def process_airfoil(af):
             "name": "shared_spar",
         }
     )
-    af.add_shear_web(sw_shared, n_elements=5)
     # Example: set 20 elements in first panel, 30 in second, etc.
     # Assuming 3 panels after adding shear web
-    af.remesh(n_elements_per_panel={0: 20, 1: 30, 2: 25})
+    with af.deferred_remesh(n_elements_per_panel={0: 20, 1: 30, 2: 25}):
+        af.add_shear_web(sw_shared, n_elements=5)
     return af
 
 
-# Load base airfoil
+# Load base airfoil, its normalized points are shared by all sections
 base_af = Airfoil.from_xfoil("examples/naca0018.dat")
+base_points = base_af.original_points
 
 # Define the three base airfoils
 base_airfoils = [
@@ -40,52 +44,42 @@ base_airfoils = [
 # Interpolate to 30 sections (31 airfoils for 30 intervals)
 n_sections = 30
 n_airfoils = n_sections + 1
-airfoils = []
-for i in range(n_airfoils):
-    t = i / n_sections  # 0 to 1
-    # Linear interpolation between the three
-    if t <= 0.5:
-        t_local = t * 2  # 0 to 1 between first and second
-        chord = base_airfoils[0]["chord"] + t_local * (
-            base_airfoils[1]["chord"] - base_airfoils[0]["chord"]
-        )
-        position = base_airfoils[0]["position"] + t_local * (
-            base_airfoils[1]["position"] - base_airfoils[0]["position"]
-        )
-        rotation = base_airfoils[0]["rotation"] + t_local * (
-            base_airfoils[1]["rotation"] - base_airfoils[0]["rotation"]
-        )
-    else:
-        t_local = (t - 0.5) * 2  # 0 to 1 between second and third
-        chord = base_airfoils[1]["chord"] + t_local * (
-            base_airfoils[2]["chord"] - base_airfoils[1]["chord"]
-        )
-        position = base_airfoils[1]["position"] + t_local * (
-            base_airfoils[2]["position"] - base_airfoils[1]["position"]
-        )
-        rotation = base_airfoils[1]["rotation"] + t_local * (
-            base_airfoils[2]["rotation"] - base_airfoils[1]["rotation"]
-        )
-    af = copy.deepcopy(base_af)
-    af.chord = chord
-    af.position = position
-    af.rotation = rotation
-    airfoils.append(af)
+# Piecewise linear interpolation between the three, for all sections at once
+t = np.linspace(0, 1, n_airfoils)
+t_base = [0.0, 0.5, 1.0]
+chords = np.interp(t, t_base, [af["chord"] for af in base_airfoils])
+rotations = np.interp(t, t_base, [af["rotation"] for af in base_airfoils])
+base_positions = np.array([af["position"] for af in base_airfoils])
+positions = np.column_stack(
+    [np.interp(t, t_base, base_positions[:, k]) for k in range(3)]
+)
+airfoils = [
+    Airfoil(
+        base_points,
+        is_normalized=True,
+        chord=chord,
+        position=position,
+        rotation=rotation,
+    )
+    for chord, position, rotation in zip(chords, positions, rotations)
+]
 
 # Process airfoils in parallel
 processed_airfoils = process_airfoils_parallel(airfoils, process_airfoil)
 
-# Create MultiBlock for all meshes
+# Convert the sections concurrently, then collect them in one MultiBlock
+with ThreadPoolExecutor() as executor:
+    meshes = list(executor.map(lambda af: af.to_pyvista(), processed_airfoils))
 multi_block = pv.MultiBlock()
-for i, af in enumerate(processed_airfoils):
-    mesh = af.to_pyvista()
+for i, mesh in enumerate(meshes):
     multi_block.append(mesh, f"Section_{i}")
 
 # Save all to a single VTM file
-multi_block.save("airfoils_30_sections.vtm")
-logger.info(
-    "Saved 30 interpolated airfoils with shared shear web "
-    "processed in parallel to airfoils_30_sections.vtm"
-)
+if not fast:
+    multi_block.save("airfoils_30_sections.vtm")
+    logger.info(
+        "Saved 30 interpolated airfoils with shared shear web "
+        "processed in parallel to airfoils_30_sections.vtm"
+    )
 
 logger.info("30 interpolated airfoils with shared shear web processed in parallel.")
@@ -1,15 +1,23 @@
 import os
+from pathlib import Path
 import yaml
 import numpy as np
 import pyvista as pv
 from b3_msh.utils.logger import get_logger
-from b3_msh.core.blade_processing import process_section_from_mesh
+from b3_msh.core.blade_processing import SAVE_OPTIONS, process_sections
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
+
+fast = bool(os.environ.get("B3_MSH_FAST"))
 
 
 def load_yaml_config(config_path):
     """Load YAML configuration file."""
     with open(config_path, "r") as f:
-        config = yaml.safe_load(f)
+        config = yaml.load(f, Loader=SafeLoader)
     return config
 
 
@@ -21,45 +29,50 @@ def main():
     config = load_yaml_config(config_path)
 
     workdir = config["workdir"]
+    base_dir = Path("examples") / workdir
     mesh_config = config["mesh"]
     z_specs = mesh_config["z"]
-    z_values = []
+    z_arrays = []
     for z_spec in z_specs:
         if z_spec["type"] == "plain":
-            z_values.extend(z_spec["values"])
+            z_arrays.append(np.asarray(z_spec["values"], dtype=float))
         elif z_spec["type"] == "linspace":
-            z_values.extend(
+            z_arrays.append(
                 np.linspace(z_spec["values"][0], z_spec["values"][1], z_spec["num"])
             )
+    # Sorted and without duplicates, so the sections come out in span order
+    z_values = np.unique(np.concatenate(z_arrays))
     logger.info(f"Found z sections: {np.round(z_values, 2).tolist()}")
     chordwise_mesh = mesh_config["chordwise"]
     webs_config = config["structure"]["webs"]
 
     # Load the pre-processed mesh
-    input_path = os.path.join("examples", workdir, "b3_geo", "lm1_mesh.vtp")
+    input_path = base_dir / "b3_geo" / "lm1_mesh.vtp"
     logger.info(f"Loading pre-processed mesh from {input_path}")
     mesh = pv.read(input_path)
     logger.info("Loaded mesh successfully")
-    logger.info("Processing sections")
-    # Process each section
-    sections = []
-    for z in z_values:
-        logger.info(f"Processing section at z={z}")
-        af = process_section_from_mesh(mesh, z, chordwise_mesh, webs_config, logger)
-        sections.append(af)
+    # Process the independent sections in parallel
+    logger.info(f"Processing {len(z_values)} sections in parallel")
+    sections = process_sections(mesh, z_values, chordwise_mesh, webs_config, logger)
 
     logger.info("Creating new MultiBlock mesh")
-    # Create new MultiBlock
+    # Create new MultiBlock, sized once for all sections
     new_multi_block = pv.MultiBlock()
+    new_multi_block.n_blocks = len(sections)
     for i, af in enumerate(sections):
-        mesh_out = af.to_pyvista()
-        new_multi_block.append(mesh_out, f"Section_{i}")
+        new_multi_block[i] = af.to_pyvista()
+        new_multi_block.set_block_name(i, f"Section_{i}")
+
+    if fast:
+        logger.info(f"Created {len(sections)} sections, skipping save")
+        return
 
     # Save to VTM (MultiBlock format)
-    output_path = os.path.join("examples", workdir, "b3_msh", "lm2.vtm")
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    out_dir = base_dir / "b3_msh"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    output_path = out_dir / "lm2.vtm"
     logger.info(f"Saving mesh to {output_path}")
-    new_multi_block.save(output_path)
+    new_multi_block.save(output_path, **SAVE_OPTIONS)
     logger.info(f"Saved remeshed blade mesh to {output_path}")
 
 
@@ -1,8 +1,13 @@
-"""Run all example scripts in sequence."""
+"""Run all example scripts concurrently.
+
+Pass --fast to set B3_MSH_FAST, which the examples read as a request to skip
+their plots and file output for a quick smoke-test run.
+"""
 
 import subprocess
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 # List of example scripts to run
 examples = [
@@ -16,13 +21,35 @@ examples = [
 project_root = os.path.dirname(os.path.dirname(__file__))
 os.chdir(project_root)
 
-for ex in examples:
-    ex_path = os.path.join("examples", ex)
-    print(f"Running {ex_path}...")
-    result = subprocess.run([sys.executable, ex_path])
-    if result.returncode != 0:
-        print(f"Failed to run {ex_path} with return code {result.returncode}")
-        sys.exit(1)
-    print(f"{ex_path} completed successfully.\n")
+# Render any plots off-screen, and pass --fast on through B3_MSH_FAST
+env = dict(os.environ, MPLBACKEND="Agg")
+if "--fast" in sys.argv[1:]:
+    env["B3_MSH_FAST"] = "1"
+
+
+def run_example(ex_path):
+    """Run one example in its own interpreter and capture its output."""
+    return subprocess.run(
+        [sys.executable, ex_path], capture_output=True, text=True, env=env
+    )
+
+
+# Each example runs in a separate process already, so threads are enough to
+# wait on them concurrently
+ex_paths = [os.path.join("examples", ex) for ex in examples]
+with ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1)) as executor:
+    futures = [executor.submit(run_example, ex_path) for ex_path in ex_paths]
+    # Report in the listed order, stopping at the first failure
+    for ex_path, future in zip(ex_paths, futures):
+        print(f"Running {ex_path}...")
+        result = future.result()
+        sys.stdout.write(result.stdout)
+        sys.stderr.write(result.stderr)
+        if result.returncode != 0:
+            print(f"Failed to run {ex_path} with return code {result.returncode}")
+            for pending in futures:
+                pending.cancel()
+            sys.exit(1)
+        print(f"{ex_path} completed successfully.\n")
 
 print("All examples ran successfully!")
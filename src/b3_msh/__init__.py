@@ -1,7 +1,26 @@
 """b3_msh package initialization."""
 
-from .core.airfoil import Airfoil
-from .core.shear_web import ShearWeb
-from .utils.utils import process_airfoils_parallel
+import importlib
 
 __all__ = ["Airfoil", "ShearWeb", "process_airfoils_parallel"]
+
+# Public names and their modules, imported on first access so that importing
+# a submodule such as the CLI does not load scipy and pyvista up front
+_LAZY_IMPORTS = {
+    "Airfoil": ".core.airfoil",
+    "ShearWeb": ".core.shear_web",
+    "process_airfoils_parallel": ".utils.utils",
+}
+
+
+def __getattr__(name):
+    """Import public names on first access."""
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    """List the public names along with the module globals."""
+    return sorted(set(globals()) | set(__all__))
@@ -54,6 +54,12 @@ plot_cmd = command(
             default=0,
             help="Rotation in degrees.",
         ),
+        option(
+            flags=["--output", "-o"],
+            arg_type=str,
+            default=None,
+            help="Save the plot to this image file instead of showing it.",
+        ),
         option(
             flags=["--verbose", "-v"],
             arg_type=bool,
@@ -117,6 +123,12 @@ blade_cmd = command(
             default="vtp",
             help="Output format: 'vtp' for merged PolyData or 'vtm' for MultiBlock.",
         ),
+        option(
+            flags=["--max-workers", "-j"],
+            arg_type=int,
+            default=None,
+            help="Worker processes for the sections; 1 processes them serially.",
+        ),
         option(
             flags=["--verbose", "-v"],
             arg_type=bool,
@@ -1,11 +1,11 @@
+import copy
 import logging
 import numpy as np
 import os
-import yaml
-import pyvista as pv
-from ..core.airfoil import Airfoil
 from ..utils.logger import get_logger
-from ..core.blade_processing import process_section_from_mesh
+
+# pyvista, yaml and the airfoil modules are imported by the commands that use
+# them, so that --help and the other commands do not pay for loading them
 
 
 def plot(
@@ -15,23 +15,30 @@ def plot(
     py=0,
     pz=0,
     rotation: float = 0,
+    output: str = None,
     verbose: bool = False,
 ):
-    """Plot an airfoil from file."""
+    """Plot an airfoil from file, or save the plot to output without a GUI."""
     logger = get_logger("CLI")
     if verbose:
         logger.setLevel(logging.DEBUG)
         logger.info("Verbose logging enabled")
     else:
         logger.setLevel(logging.WARNING)
-    logger.info(f"Plotting airfoil from {file}")
+    logger.info("Plotting airfoil from %s", file)
+    from ..core.airfoil import Airfoil
+
     af = Airfoil.from_xfoil(
         file,
         chord=chord,
         position=(px, py, pz),
         rotation=rotation,
     )
-    af.plot()
+    if output:
+        os.environ["B3_MSH_HEADLESS"] = "1"  # No window is shown, skip the GUI
+        af.plot(save_path=output, show=False)
+    else:
+        af.plot()
     logger.debug("Plot command completed")
 
 
@@ -48,74 +55,116 @@ def remesh(
         logger.info("Verbose logging enabled")
     else:
         logger.setLevel(logging.WARNING)
-    logger.info(f"Remeshing airfoil from {file}")
+    logger.info("Remeshing airfoil from %s", file)
+    from ..core.airfoil import Airfoil
+
     af = Airfoil.from_xfoil(file)
-    af.remesh(n_points=n_points)
-    np.savetxt(output, af.current_points[:, :2], header="x y", comments="")
-    logger.info(f"Remeshed points saved to {output}")
+    af.remesh(total_n_points=n_points)
+    _save_points(output, af.current_points[:, :2])
+    logger.info("Remeshed points saved to %s", output)
     logger.debug("Remesh command completed")
 
 
+def _save_points(output, points):
+    """Save points as .npy, compressed .npz or text, based on the extension."""
+    ext = os.path.splitext(output)[1].lower()
+    if ext == ".npy":
+        np.save(output, points)
+    elif ext == ".npz":
+        np.savez_compressed(output, points=points)
+    else:
+        # One %-format over all values, as np.savetxt formats row by row
+        row = " ".join(["%.8g"] * points.shape[1]) + "\n"
+        text = "x y\n" + (row * len(points)) % tuple(points.ravel().tolist())
+        with open(output, "w") as f:
+            f.write(text)
+
+
+# Parsed files by absolute path, as (st_mtime_ns, content), least recently
+# used first and limited to the last few files
+_FILE_CACHE = {}
+_FILE_CACHE_SIZE = 4
+
+
+def _cached(path, loader):
+    """Load a file with loader, reusing the result while the file is unchanged.
+
+    Callers get a deep copy, so editing the result does not change the cache.
+    """
+    path = os.path.abspath(path)
+    mtime = os.stat(path).st_mtime_ns
+    cached = _FILE_CACHE.pop(path, None)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, loader(path))
+    _FILE_CACHE[path] = cached  # Reinserted as most recently used
+    while len(_FILE_CACHE) > _FILE_CACHE_SIZE:
+        del _FILE_CACHE[next(iter(_FILE_CACHE))]
+    return copy.deepcopy(cached[1])
+
+
 def _load_config(config_path):
     """Load YAML config."""
-    with open(config_path, "r") as f:
-        return yaml.safe_load(f)
+    import yaml
+
+    try:
+        from yaml import CSafeLoader as SafeLoader
+    except ImportError:  # PyYAML built without libyaml
+        from yaml import SafeLoader
 
+    # Bytes go straight to the libyaml scanner, without decoding in Python
+    with open(config_path, "rb") as f:
+        return yaml.load(f, Loader=SafeLoader)
+
+
+def _process_sections(
+    logger, mesh, z_sections, chordwise_mesh, webs_config, max_workers=None
+):
+    """Process sections from mesh, in parallel over worker processes."""
+    from ..core.blade_processing import process_sections
 
-def _process_sections(logger, mesh, z_sections, chordwise_mesh, webs_config):
-    """Process sections from mesh."""
     logger.info("Processing sections")
-    sections = []
-    for z in z_sections:
-        af = process_section_from_mesh(mesh, z, chordwise_mesh, webs_config, logger)
-        sections.append(af)
-    return sections
+    return process_sections(
+        mesh, z_sections, chordwise_mesh, webs_config, logger, max_workers
+    )
+
 
+def _save_as_vtm(logger, meshes, output_path):
+    """Save section meshes as VTM."""
+    import pyvista as pv
+    from ..core.blade_processing import SAVE_OPTIONS
 
-def _save_as_vtm(logger, sections, output_path):
-    """Save as VTM."""
     logger.info("Creating new MultiBlock mesh")
     new_multi_block = pv.MultiBlock()
-    for i, af in enumerate(sections):
-        mesh_out = af.to_pyvista()
-        new_multi_block.append(mesh_out, f"Section_{i}")
+    new_multi_block.n_blocks = len(meshes)
+    for i, mesh_out in enumerate(meshes):
+        new_multi_block[i] = mesh_out
+        new_multi_block.set_block_name(i, f"Section_{i}")
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    logger.info(f"Saving mesh to {output_path}")
-    new_multi_block.save(output_path)
+    logger.info("Saving mesh to %s", output_path)
+    new_multi_block.save(output_path, **SAVE_OPTIONS)
+
 
+def _save_as_vtp(logger, meshes, output_path):
+    """Save section meshes merged as VTP."""
+    from ..core.blade_processing import (
+        SAVE_OPTIONS,
+        add_cell_averages,
+        merge_line_meshes,
+    )
 
-def _save_as_vtp(logger, sections, output_path):
-    """Save as VTP."""
     logger.info("Merging meshes into single PolyData")
-    meshes = [af.to_pyvista() for af in sections]
-    rmeshes = []
-    for mesh in meshes:
-        rmeshes.append(
-            mesh.point_data_to_cell_data(progress_bar=False, pass_point_data=True)
-        )
-        for key in ["Normals", "z"]:
-            if key in mesh.cell_data:
-                del mesh.cell_data[key]
-    merged_mesh = pv.merge(rmeshes)
-    for field in mesh.point_data.keys():
-        if rmeshes and field in rmeshes[0].cell_data:
-            merged_values = np.concatenate(
-                [rmesh.cell_data[field] for rmesh in rmeshes]
-            )
-            merged_mesh.cell_data[field] = merged_values
-    poly = pv.PolyData()
-    poly.points = merged_mesh.points
-    poly.lines = merged_mesh.lines
-    for key, value in merged_mesh.cell_data.items():
-        poly.cell_data[key] = value
-    for key, value in merged_mesh.point_data.items():
-        poly.point_data[key] = value
+    poly = merge_line_meshes([add_cell_averages(mesh) for mesh in meshes])
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    logger.info(f"Saving merged mesh to {output_path}")
-    poly.save(output_path)
+    logger.info("Saving merged mesh to %s", output_path)
+    poly.save(output_path, **SAVE_OPTIONS)
 
 
-def blade(config: str, output_format: str = "vtp", verbose: bool = False):
+def blade(
+    config: str,
+    output_format: str = "vtp",
+    max_workers: int = None,
+    verbose: bool = False,
+):
     """Process blade from YAML config."""
     logger = get_logger("CLI")
     if verbose:
@@ -123,9 +172,11 @@ def blade(config: str, output_format: str = "vtp", verbose: bool = False):
         logger.info("Verbose logging enabled")
     else:
         logger.setLevel(logging.INFO)
-    logger.info(f"Processing blade from {config}")
+    logger.info("Processing blade from %s", config)
+    import pyvista as pv
+    from ..core.blade_processing import section_meshes
 
-    config_data = _load_config(config)
+    config_data = _cached(config, _load_config)
     config_dir = os.path.dirname(os.path.abspath(config))
     workdir = os.path.join(config_dir, config_data["workdir"])
     mesh_config = config_data["mesh"]
@@ -133,22 +184,27 @@ def blade(config: str, output_format: str = "vtp", verbose: bool = False):
     webs_config = config_data["structure"]["webs"]
 
     input_path = os.path.join(workdir, "b3_geo", "lm1_mesh.vtp")
-    logger.info(f"Loading pre-processed mesh from {input_path}")
-    mesh = pv.read(input_path)
+    logger.info("Loading pre-processed mesh from %s", input_path)
+    mesh = _cached(input_path, pv.read)
+
+    z_sections = np.unique(mesh.points[:, 2])  # Sorted by np.unique
+    if logger.isEnabledFor(logging.INFO):  # Skip building the list otherwise
+        logger.info(
+            "Found %d z sections: %s",
+            len(z_sections),
+            np.round(z_sections, 2).tolist(),
+        )
 
-    z_sections = np.unique(mesh.points[:, 2])
-    z_sections = np.sort(z_sections)
-    logger.info(
-        f"Found {len(z_sections)} z sections: {np.round(z_sections, 2).tolist()}"
+    sections = _process_sections(
+        logger, mesh, z_sections, chordwise_mesh, webs_config, max_workers
     )
-
-    sections = _process_sections(logger, mesh, z_sections, chordwise_mesh, webs_config)
+    meshes = section_meshes(sections)  # Converted once, for either format
 
     if output_format == "vtm":
         output_path = os.path.join(workdir, "b3_msh", "lm2.vtm")
-        _save_as_vtm(logger, sections, output_path)
+        _save_as_vtm(logger, meshes, output_path)
     else:
         output_path = os.path.join(workdir, "b3_msh", "lm2.vtp")
-        _save_as_vtp(logger, sections, output_path)
+        _save_as_vtp(logger, meshes, output_path)
 
-    logger.info(f"Saved remeshed blade mesh to {output_path}")
+    logger.info("Saved remeshed blade mesh to %s", output_path)
@@ -1,96 +1,170 @@
 """Core functionality for Airfoil initialization,
 spline building, and transformations."""
 
+import functools
+import os
+
 import numpy as np
 from scipy.interpolate import PchipInterpolator
 from ..utils.logger import get_logger
 
 
+@functools.lru_cache(maxsize=32)
+def _read_xfoil(path, mtime):
+    """Read the coordinates of an XFOIL file, cached on path and mtime."""
+    data = np.loadtxt(path, skiprows=1)  # Skip name line
+    data.flags.writeable = False  # Shared between all airfoils loaded from path
+    return data
+
+
 class AirfoilCore:
     """Core functionality for Airfoil initialization,
     spline building, and transformations."""
 
+    _transform = None  # Scale and rotation matrix, applied as points @ _transform
+    _transform_key = None  # (chord, rotation) that _transform was built for
+    _dirty = False  # Hard points changed since the last remesh
+
     def __init__(
         self, points, is_normalized=True, chord=1.0, position=(0, 0, 0), rotation=0
     ):
         """Initialize an Airfoil."""
         self.logger = get_logger(self.__class__.__name__)
         self.logger.debug("Initializing AirfoilCore")
-        self.original_points = np.array(points)
-        if self.original_points.shape[1] == 2:
-            self.original_points = np.column_stack(
-                [self.original_points, np.zeros(len(self.original_points))]
-            )
+        # Copy writeable points, so the caller cannot change them under the
+        # spline, but share read-only ones such as another airfoil's
+        points = np.asarray(points, dtype=float)
+        if points.shape[1] == 2:
+            points = np.column_stack([points, np.zeros(len(points))])
+        elif points.flags.writeable:
+            points = points.copy()
+        points.flags.writeable = False  # Copies of this airfoil share it safely
+        self.original_points = points
         self.is_normalized = is_normalized
         self.chord = chord
         self.position = np.array(position)
         self.rotation = rotation  # degrees, around z-axis
-        self.hard_points = [0.0, 1.0]  # Default hard points at ends
+        self._hp_sorted = np.array([0.0, 1.0])  # Default hard points at ends
         self.hard_point_names = {0.0: "t0", 1.0: "t1"}
         self.shear_webs = []  # List of ShearWeb instances
         self.shear_web_refinements = {}  # Dict of shear_web to refinement_factor
         self.shear_web_n_elements = {}  # Dict of shear_web to n_elements
+        self._sw_cache = {}  # Dict of shear_web to (transform, intersections)
+        self._arc_length_cache = {}  # Unit chord arc lengths by (t1, t2)
         self.rel_span = None  # Normalized span position
-        self.current_t = np.linspace(0, 1, 100)  # Default t distribution
-        self.current_points = None
+        self._current_t = np.linspace(0, 1, 100)  # Default t distribution
+        self._current_points = None
+        self._normalized_points = None  # Untransformed points at current_t
         self._build_spline()
-        self.remesh(self.current_t)  # Initial mesh
+        self.remesh(self._current_t)  # Initial mesh
         self.logger.debug(
-            f"AirfoilCore initialized with {len(self.original_points)} points"
+            "AirfoilCore initialized with %d points", len(self.original_points)
         )
 
+    def __deepcopy__(self, memo):
+        """Copy the airfoil state, sharing the read-only points and splines."""
+        new = object.__new__(type(self))
+        memo[id(self)] = new
+        for name, value in self.__dict__.items():
+            if isinstance(value, np.ndarray) and value is not self.original_points:
+                value = value.copy()
+            elif isinstance(value, (list, dict)):
+                value = value.copy()
+            new.__dict__[name] = value
+        return new
+
+    @property
+    def current_t(self):
+        """Mesh t values, remeshing first if hard points changed since."""
+        if self._dirty:
+            self.remesh()
+        return self._current_t
+
+    @current_t.setter
+    def current_t(self, value):
+        self._current_t = value
+
+    @property
+    def current_points(self):
+        """Mesh points, remeshing first if hard points changed since."""
+        if self._dirty:
+            self.remesh()
+        return self._current_points
+
+    @current_points.setter
+    def current_points(self, value):
+        self._current_points = value
+
     def _build_spline(self):
-        """Build PCHIP splines for x, y, z from original points."""
+        """Build a PCHIP spline through the original points, and its derivative."""
         self.logger.debug("Building spline")
         # Compute parametric t based on cumulative arc length
         diffs = np.diff(self.original_points, axis=0)
-        dist = np.sqrt(np.sum(diffs**2, axis=1))
-        cum_dist = np.cumsum(dist)
-        cum_dist = np.insert(cum_dist, 0, 0)
-        t_orig = cum_dist / cum_dist[-1]
-        self.spline_x = PchipInterpolator(t_orig, self.original_points[:, 0])
-        self.spline_y = PchipInterpolator(t_orig, self.original_points[:, 1])
-        self.spline_z = PchipInterpolator(t_orig, self.original_points[:, 2])
+        dist = np.linalg.norm(diffs, axis=1)
+        t_orig = np.empty(len(self.original_points))
+        t_orig[0] = 0.0
+        np.cumsum(dist, out=t_orig[1:])
+        t_orig /= t_orig[-1]
+        # One interpolator for all three coordinates, evaluating to (N, 3)
+        self.spline = PchipInterpolator(t_orig, self.original_points, axis=0)
+        self.spline_deriv = self.spline.derivative()
+        self._sw_cache.clear()  # Intersections and lengths depend on the spline
+        self._arc_length_cache.clear()
         self.logger.debug("Spline built successfully")
 
-    def _apply_transformations(self, points):
-        """Apply scaling, rotation, and translation."""
-        self.logger.debug("Applying transformations")
-        # Scale by chord
-        points *= self.chord
-        # Rotate around z-axis
+    def _rotation_matrix(self):
+        """Get the rotation matrix around the z-axis for the current rotation."""
         rot_rad = np.radians(self.rotation)
-        rot_matrix = np.array(
+        return np.array(
             [
                 [np.cos(rot_rad), -np.sin(rot_rad), 0],
                 [np.sin(rot_rad), np.cos(rot_rad), 0],
                 [0, 0, 1],
             ]
         )
-        points = points @ rot_matrix.T
-        # Translate
+
+    def _transform_matrix(self):
+        """Get the combined chord scaling and rotation matrix, cached."""
+        key = (self.chord, self.rotation)
+        if key != self._transform_key:
+            self._transform = self.chord * self._rotation_matrix().T
+            self._transform_key = key
+        return self._transform
+
+    def _apply_transformations(self, points):
+        """Apply scaling, rotation, and translation."""
+        self.logger.debug("Applying transformations")
+        # Scale by chord and rotate around z-axis in one product, then translate
+        points = points @ self._transform_matrix()
         points += self.position
         self.logger.debug("Transformations applied")
         return points
 
+    def _get_normalized_points(self, t_values):
+        """Get interpolated points at given t values, without transformations."""
+        return np.ascontiguousarray(self.spline(t_values))
+
     def get_points(self, t_values):
         """Get interpolated points at given t values, with transformations applied."""
-        self.logger.debug(f"Getting points for t_values: {len(t_values)} values")
-        x = self.spline_x(t_values)
-        y = self.spline_y(t_values)
-        z = self.spline_z(t_values)
-        points = np.column_stack([x, y, z])
-        return self._apply_transformations(points)
+        self.logger.debug("Getting points for t_values: %d values", len(t_values))
+        return self._apply_transformations(self._get_normalized_points(t_values))
+
+    def apply_transform(self):
+        """Update current points after a change of chord, position or rotation.
+
+        Reuses the cached untransformed points of the current mesh, so no
+        spline evaluation is needed.
+        """
+        self.current_points = self._apply_transformations(self._normalized_points)
 
     @classmethod
     def from_xfoil(cls, filename, **kwargs):
         """Load airfoil from XFOIL format file."""
         cls.logger = get_logger(cls.__name__)
-        cls.logger.info(f"Loading airfoil from XFOIL file: {filename}")
-        with open(filename, "r") as f:
-            lines = f.readlines()
-        data = np.loadtxt(lines[1:])  # Skip name line
-        cls.logger.debug(f"Loaded {len(data)} points from file")
+        cls.logger.info("Loading airfoil from XFOIL file: %s", filename)
+        path = os.path.abspath(filename)
+        data = _read_xfoil(path, os.path.getmtime(path))
+        cls.logger.debug("Loaded %d points from file", len(data))
         return cls(data, **kwargs)
 
     @classmethod
@@ -102,14 +176,17 @@ class AirfoilCore:
 
     def rotate(self, angle):
         """Rotate the airfoil by angle degrees around z-axis."""
-        self.logger.debug(f"Rotating airfoil by {angle} degrees")
+        self.logger.debug("Rotating airfoil by %s degrees", angle)
         self.rotation += angle
-        self.current_points = self.get_points(self.current_t)
+        self.apply_transform()
         self.logger.debug("Rotation applied")
 
     def translate(self, x, y, z):
         """Translate the airfoil by (x, y, z)."""
-        self.logger.debug(f"Translating airfoil by ({x}, {y}, {z})")
-        self.position += np.array([x, y, z])
-        self.current_points = self.get_points(self.current_t)
+        self.logger.debug("Translating airfoil by (%s, %s, %s)", x, y, z)
+        delta = np.array([x, y, z])
+        self.position += delta
+        # A shift only needs adding to the mesh, which is rebuilt anyway if dirty
+        if self._current_points is not None:
+            self._current_points = self._current_points + delta
         self.logger.debug("Translation applied")
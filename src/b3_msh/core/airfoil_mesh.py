@@ -1,66 +1,143 @@
 """Meshing functionality for Airfoil, including
 hard points, panels, and remeshing."""
 
+import contextlib
+
 import numpy as np
 from ..utils.logger import get_logger
 
+# Gauss-Legendre nodes and weights on [-1, 1] for integrating along the spline
+_GAUSS_NODES, _GAUSS_WEIGHTS = np.polynomial.legendre.leggauss(4)
+# Hard points closer than this in t are treated as the same point
+_HARD_POINT_TOL = 1e-12
+
+
+def _resample_panels(t_starts, t_ends, n_points):
+    """Concatenate np.linspace(t_starts[i], t_ends[i], n_points[i]) over panels.
+
+    Evaluated for all panels at once, giving the same values as linspace.
+    """
+    t_starts = np.asarray(t_starts, dtype=float)
+    t_ends = np.asarray(t_ends, dtype=float)
+    n_points = np.asarray(n_points, dtype=int)
+    first = np.cumsum(n_points) - n_points  # Index of each panel's first point
+    # Point index within its panel, and the panel's linspace step
+    i = np.arange(n_points.sum()) - np.repeat(first, n_points)
+    step = (t_ends - t_starts) / np.maximum(n_points - 1, 1)
+    t_vals = np.repeat(t_starts, n_points) + i * np.repeat(step, n_points)
+    # linspace puts the end point exactly on the panel end
+    has_end = n_points > 1
+    t_vals[(first + n_points - 1)[has_end]] = t_ends[has_end]
+    return t_vals
+
+
+def _build_t_vals(hard_points, n_elements):
+    """Get t values splitting each panel between hard points into n_elements.
+
+    Panels with zero elements contribute only their start point.
+    """
+    hard_points = np.asarray(hard_points, dtype=float)
+    return _resample_panels(
+        hard_points[:-1], hard_points[1:], np.asarray(n_elements, dtype=int) + 1
+    )
+
 
 class AirfoilMesh:
     """Meshing functionality for Airfoil, including
     hard points, panels, and remeshing."""
 
+    _defer_remesh = False  # Set while inside deferred_remesh()
+
     def __init__(self):
         self.logger = get_logger(self.__class__.__name__)
 
-    def _arc_length(self, t1, t2, n_samples=1000):
-        """Approximate arc length between t1 and t2."""
-        self.logger.debug(f"Calculating arc length from {t1} to {t2}")
-        t_samples = np.linspace(t1, t2, n_samples)
-        points = self.get_points(t_samples)
-        diffs = np.diff(points, axis=0)
-        length = np.sum(np.sqrt(np.sum(diffs**2, axis=1)))
-        self.logger.debug(f"Arc length: {length}")
+    def _arc_length(self, t1, t2):
+        """Arc length between t1 and t2, integrating the spline speed."""
+        key = (t1, t2)
+        if key not in self._arc_length_cache:
+            self.logger.debug("Calculating arc length from %s to %s", t1, t2)
+            # Gauss quadrature on each spline interval, where the speed is smooth
+            knots = self.spline.x
+            edges = np.concatenate([[t1], knots[(knots > t1) & (knots < t2)], [t2]])
+            half = np.diff(edges)[:, None] / 2
+            t_nodes = edges[:-1, None] + half * (_GAUSS_NODES + 1)
+            speed = np.linalg.norm(self.spline_deriv(t_nodes.ravel()), axis=1)
+            self._arc_length_cache[key] = np.sum(
+                half * speed.reshape(t_nodes.shape) * _GAUSS_WEIGHTS
+            )
+        # Rotation and translation preserve lengths, only the chord scales them
+        length = self.chord * self._arc_length_cache[key]
+        self.logger.debug("Arc length: %s", length)
         return length
 
+    @property
+    def hard_points(self):
+        """Sorted hard point t values, as a tuple so they cannot be modified."""
+        return tuple(self._hp_sorted.tolist())
+
     def add_hard_point(self, t, name=None):
         """Add a hard point at parametric t."""
         if not (0 <= t <= 1):
-            self.logger.warning(f"Hard point at t={t} not added: invalid value")
+            self.logger.warning("Hard point at t=%s not added: invalid value", t)
             return
-        if t in self.hard_points:
-            # Already exists, skip
+        pos = np.searchsorted(self._hp_sorted, t)
+        # Already exists up to round-off on either side, skip
+        neighbours = self._hp_sorted[max(pos - 1, 0) : pos + 1]
+        if np.any(np.abs(neighbours - t) <= _HARD_POINT_TOL):
             return
-        self.hard_points.append(t)
-        self.hard_points.sort()
+        self._hp_sorted = np.insert(self._hp_sorted, pos, t)
         if name is None:
             name = f"hp{len(self.hard_point_names)}"
         self.hard_point_names[t] = name
-        self.remesh()  # Update mesh to include new hard points
-        self.logger.debug(f"Hard point added: {name} at t={t}")
+        self._dirty = True  # Mesh is updated on next use
+        self.logger.debug("Hard point added: %s at t=%s", name, t)
 
     def add_shear_web(self, shear_web, refinement_factor=1.0, n_elements=None):
         """Add a shear web, which adds hard points at intersections."""
-        self.logger.debug(f"Adding shear web: {shear_web.definition}")
+        self.logger.debug("Adding shear web: %s", shear_web.definition)
         shear_web.name = shear_web.definition.get("name", f"web{len(self.shear_webs)}")
         self.shear_webs.append(shear_web)
         self.shear_web_refinements[shear_web] = refinement_factor
         self.shear_web_n_elements[shear_web] = (
             n_elements if n_elements is not None else 1
         )
-        t1, t2 = shear_web.compute_intersections(self)
+        t1, t2 = self._sw_intersections(shear_web)
         self.add_hard_point(t1, name=f"{shear_web.name}_hp0")
         self.add_hard_point(t2, name=f"{shear_web.name}_hp1")
-        self.remesh()  # Update mesh to include new hard points
-        self.logger.debug(f"Shear web added with intersections at t={t1}, t={t2}")
+        self.logger.debug("Shear web added with intersections at t=%s, t=%s", t1, t2)
+
+    def _sw_intersections(self, shear_web):
+        """Get the intersections of a shear web, cached until the transform changes."""
+        key = (self.chord, self.rotation, tuple(self.position.tolist()))
+        cached = self._sw_cache.get(shear_web)
+        if cached is None or cached[0] != key:
+            cached = (key, shear_web.compute_intersections(self))
+            self._sw_cache[shear_web] = cached
+        return cached[1]
+
+    @contextlib.contextmanager
+    def deferred_remesh(self, **remesh_kwargs):
+        """Group hard point and shear web changes under a single remesh.
+
+        On exit the mesh is rebuilt once by calling remesh with the given
+        keyword arguments; without arguments it is rebuilt lazily on next use.
+        Nested blocks only remesh when the outermost exits.
+        """
+        outer = self._defer_remesh
+        self._defer_remesh = True
+        try:
+            yield self
+        finally:
+            self._defer_remesh = outer
+        if not outer and remesh_kwargs:
+            self.remesh(**remesh_kwargs)
 
     def get_panels(self):
         """Get list of panels as (t_start, t_end) tuples."""
         self.logger.debug("Getting panels")
-        panels = []
-        sorted_hp = sorted(self.hard_points)
-        for i in range(len(sorted_hp) - 1):
-            panels.append((sorted_hp[i], sorted_hp[i + 1]))
-        self.logger.debug(f"Panels: {panels}")
+        hp = self._hp_sorted.tolist()
+        panels = list(zip(hp[:-1], hp[1:]))
+        self.logger.debug("Panels: %s", panels)
         return panels
 
     def _determine_remesh_params(
@@ -73,29 +150,19 @@ class AirfoilMesh:
     ):
         """Determine the t_vals for remeshing based on parameters."""
         if n_elements_per_panel is not None:
-            panels = self.get_panels()
-            t_vals = []
-            for p_idx, (t_start, t_end) in enumerate(panels):
-                if isinstance(n_elements_per_panel, dict):
-                    n_elem = n_elements_per_panel.get(p_idx, 1)
-                else:
-                    n_elem = n_elements_per_panel[p_idx]
-                t_panel = np.linspace(t_start, t_end, n_elem + 1)
-                t_vals.extend(t_panel)
-            t_vals = np.sort(np.unique(t_vals))
+            n_panels = len(self._hp_sorted) - 1
+            if isinstance(n_elements_per_panel, dict):
+                n_elem = [n_elements_per_panel.get(i, 1) for i in range(n_panels)]
+            else:
+                n_elem = [n_elements_per_panel[i] for i in range(n_panels)]
+            t_vals = np.unique(_build_t_vals(self._hp_sorted, n_elem))
         elif t_distribution is not None:
             t_vals = np.array(t_distribution)
         elif total_n_points is not None:
-            panels = self.get_panels()
             total_segments = total_n_points - 1
-            t_vals = []
-            for t_start, t_end in panels:
-                length = t_end - t_start
-                segments = round(length * total_segments)
-                n_points_panel = segments + 1
-                t_panel = np.linspace(t_start, t_end, n_points_panel)
-                t_vals.extend(t_panel)
-            t_vals = np.array(t_vals)
+            lengths = np.diff(self._hp_sorted)
+            segments = np.round(lengths * total_segments).astype(int)
+            t_vals = _build_t_vals(self._hp_sorted, segments)
         elif element_length is not None:
             # Approximate based on arc length
             total_length = self._arc_length(0, 1)
@@ -103,16 +170,15 @@ class AirfoilMesh:
             t_vals = np.linspace(0, 1, n)
         elif relative_refinement is not None:
             # Refine relative to current
-            panels = self.get_panels()
-            t_vals = []
-            for i, (t_start, t_end) in enumerate(panels):
-                factor = relative_refinement.get(i, 1.0)
-                n_panel = max(10, int(len(self.current_t) * factor / len(panels)))
-                t_panel = np.linspace(t_start, t_end, n_panel)
-                t_vals.extend(t_panel)
-            t_vals = np.array(t_vals)
+            panels = np.array(self.get_panels()).reshape(-1, 2)
+            n_current = len(self._current_t)
+            n_panel = [
+                max(10, int(n_current * relative_refinement.get(i, 1.0) / len(panels)))
+                for i in range(len(panels))
+            ]
+            t_vals = _resample_panels(panels[:, 0], panels[:, 1], n_panel)
         else:
-            t_vals = self.current_t  # Default
+            t_vals = self._current_t  # Default
         return t_vals
 
     def remesh(
@@ -125,6 +191,10 @@ class AirfoilMesh:
     ):
         """Remesh the airfoil."""
         self.logger.debug("Remeshing airfoil")
+        if self._dirty:
+            # Include hard points added since the last remesh in the current t
+            self._current_t = np.union1d(self._current_t, self._hp_sorted)
+            self._dirty = False
         t_vals = self._determine_remesh_params(
             t_distribution,
             total_n_points,
@@ -133,7 +203,12 @@ class AirfoilMesh:
             n_elements_per_panel,
         )
         # Ensure hard points are included
-        all_t = np.sort(np.unique(np.concatenate([t_vals, self.hard_points])))
+        all_t = np.sort(np.unique(np.concatenate([t_vals, self._hp_sorted])))
         self.current_t = all_t
-        self.current_points = self.get_points(all_t)
-        self.logger.debug(f"Remeshing complete: {len(all_t)} points")
+        # Hard points are in all_t exactly, so a binary search locates them
+        self._hp_indices = np.searchsorted(all_t, self._hp_sorted)
+        self._hard_mask = np.zeros(len(all_t), dtype=bool)
+        self._hard_mask[self._hp_indices] = True
+        self._normalized_points = self._get_normalized_points(all_t)
+        self.apply_transform()
+        self.logger.debug("Remeshing complete: %d points", len(all_t))
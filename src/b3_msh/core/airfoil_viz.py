@@ -1,12 +1,45 @@
 """Visualization functionality for Airfoil,
 including plotting and PyVista export."""
 
+import os
+
 import numpy as np
 import pyvista as pv
-import matplotlib.pyplot as plt
 from ..utils.logger import get_logger
 
 
+def _line_connectivity(starts):
+    """Get the PolyData lines array for 2-point lines from each start index."""
+    starts = np.asarray(starts, dtype=np.int64)
+    return np.column_stack([np.full_like(starts, 2), starts, starts + 1]).ravel()
+
+
+def _unit_normals(tangents):
+    """Get unit normals in the xy plane, +z where the tangent has no xy part."""
+    normals = np.column_stack(
+        [-tangents[:, 1], tangents[:, 0], np.zeros(len(tangents))]
+    )
+    norms = np.linalg.norm(normals, axis=1)
+    valid = norms > 0
+    normals[valid] /= norms[valid, None]
+    normals[~valid] = [0, 0, 1]
+    return normals
+
+
+def _web_points(web_ends, n_points):
+    """Get the points and w along all webs, evenly spaced, in one pass.
+
+    web_ends holds one (p1, p2) row per web, each spaced with n_points.
+    """
+    w = np.concatenate([np.linspace(0, 1, n) for n in n_points] + [np.empty(0)])
+    p1 = np.repeat(web_ends[:, 0], n_points, axis=0)
+    p2 = np.repeat(web_ends[:, 1], n_points, axis=0)
+    # Exact at both ends, so web ends coincide with the airfoil points they
+    # start and end on, and are joined with them when sections are merged
+    w_col = w[:, None]
+    return p1 * (1 - w_col) + p2 * w_col, w
+
+
 class AirfoilViz:
     """Visualization functionality for Airfoil,
     including plotting and PyVista export."""
@@ -14,68 +47,43 @@ class AirfoilViz:
     def __init__(self):
         self.logger = get_logger(self.__class__.__name__)
 
+    def _web_ends(self):
+        """Get the end points of all shear webs in one call, one (p1, p2) row each."""
+        web_t = [t for sw in self.shear_webs for t in self._sw_intersections(sw)]
+        return self.get_points(web_t).reshape(-1, 2, 3)
+
     def _create_pyvista_mesh(self):
         """Create the PyVista PolyData mesh."""
         airfoil_points = self.current_points
-        web_points = []
-        web_w = []
-        web_info = []  # list of (sw, start_idx, n_points_web)
-        current_web_idx = len(airfoil_points)
-        for sw in self.shear_webs:
-            t1, t2 = sw.compute_intersections(self)
-            p1 = self.get_points([t1])[0]
-            p2 = self.get_points([t2])[0]
-            n_elements = self.shear_web_n_elements[sw]
-            n_points_web = n_elements + 1
-            web_points.append(np.linspace(p1, p2, n_points_web))
-            web_w.append(np.linspace(0, 1, n_points_web))
-            web_info.append((sw, current_web_idx, n_points_web))
-            current_web_idx += n_points_web
-        if web_points:
-            web_points = np.vstack(web_points)
-            web_w = np.concatenate(web_w)
-            all_points = np.vstack([airfoil_points, web_points])
-        else:
-            all_points = airfoil_points
-            web_w = np.array([])
-        return all_points, web_w, web_info
+        web_ends = self._web_ends()
+        n_points = [self.shear_web_n_elements[sw] + 1 for sw in self.shear_webs]
+        web_points, web_w = _web_points(web_ends, n_points)
+        # (sw, start_idx, n_points_web) of each web in the combined points
+        starts = len(airfoil_points) + np.cumsum(n_points, dtype=np.int64) - n_points
+        web_info = list(zip(self.shear_webs, starts.tolist(), n_points))
+        all_points = np.vstack([airfoil_points, web_points])
+        return all_points, web_w, web_info, web_ends
 
     def _create_lines_and_cells(self, all_points, web_info):
         """Create lines and cell data for PyVista."""
-        len(all_points)
-        lines = []
-        # Airfoil lines
-        for i in range(len(self.current_points) - 1):
-            lines.extend([2, i, i + 1])
-        # Shear web lines
-        for sw, start_idx, n_points_web in web_info:
-            for i in range(n_points_web - 1):
-                lines.extend([2, start_idx + i, start_idx + i + 1])
-        lines = np.array(lines)
-        poly = pv.PolyData(all_points, lines=lines)
-        # Add panel id to cells
-        self.get_panels()
-        n_airfoil_cells = len(self.current_points) - 1
-        total_cells = n_airfoil_cells
-        for sw in self.shear_webs:
-            n = self.shear_web_n_elements[sw]
-            total_cells += n
-        cell_data = np.zeros(total_cells, dtype=int)
-        sorted_hp = sorted(self.hard_points)
-        hp_indices = [
-            np.where(np.isclose(self.current_t, hp))[0][0] for hp in sorted_hp
-        ]
-        for p_idx in range(len(hp_indices) - 1):
-            start_idx = hp_indices[p_idx]
-            end_idx = hp_indices[p_idx + 1]
-            cell_data[start_idx:end_idx] = p_idx
+        # Start point of each line, along the airfoil and then along each web
+        starts = np.concatenate(
+            [np.arange(len(self.current_points) - 1)]
+            + [
+                np.arange(start_idx, start_idx + n_points_web - 1)
+                for _, start_idx, n_points_web in web_info
+            ]
+        )
+        poly = pv.PolyData(all_points, lines=_line_connectivity(starts))
+        # Add panel id to cells, airfoil panels run between consecutive hard points
+        panel_ids = np.arange(len(self._hp_indices) - 1)
+        airfoil_cells = np.repeat(panel_ids, np.diff(self._hp_indices))
         # Shear webs have panel_id = - (i + 1) for i in range(len(self.shear_webs))
-        cell_start = n_airfoil_cells
-        for i, sw in enumerate(self.shear_webs):
-            panel_id_web = -(i + 1)
-            n_cells_web = self.shear_web_n_elements[sw]
-            cell_data[cell_start : cell_start + n_cells_web] = panel_id_web
-            cell_start += n_cells_web
+        web_ids = -(np.arange(len(self.shear_webs)) + 1)
+        web_cells = np.repeat(
+            web_ids, [self.shear_web_n_elements[sw] for sw in self.shear_webs]
+        )
+        cell_data = np.concatenate([airfoil_cells, web_cells])
         poly.cell_data["panel_id"] = cell_data
         return poly
 
@@ -87,21 +95,23 @@ class AirfoilViz:
                 poly.cell_data[field] = np.full(poly.n_cells, value)
         # Compute cumulative arc lengths
         diffs = np.diff(self.current_points, axis=0)
-        arc_lengths = np.sqrt(np.sum(diffs**2, axis=1))
+        arc_lengths = np.linalg.norm(diffs, axis=1)
         cum_arc = np.cumsum(arc_lengths)
         cum_arc = np.insert(cum_arc, 0, 0)
-        # Add distances from hard points
-        for hp in sorted(self.hard_points):
+        # Add distances from hard points, one row per hard point, zero on webs
+        n_airfoil = len(self.current_points)
+        abs_distances = np.zeros((len(self._hp_sorted), len(all_points)))
+        abs_distances[:, :n_airfoil] = np.abs(
+            cum_arc[None, :] - cum_arc[self._hp_indices, None]
+        )
+        rel_distances = np.zeros_like(abs_distances)
+        rel_distances[:, :n_airfoil] = np.abs(
+            self.current_t[None, :] - self._hp_sorted[:, None]
+        )
+        for i, hp in enumerate(self._hp_sorted):
             name = self.hard_point_names[hp]
-            hp_idx = np.where(np.isclose(self.current_t, hp))[0][0]
-            abs_distances = np.abs(cum_arc - cum_arc[hp_idx])
-            poly.point_data[f"abs_dist_{name}"] = np.concatenate(
-                [abs_distances, np.zeros(len(all_points) - len(self.current_points))]
-            )
-            rel_distances = np.abs(self.current_t - hp)
-            poly.point_data[f"rel_dist_{name}"] = np.concatenate(
-                [rel_distances, np.zeros(len(all_points) - len(self.current_points))]
-            )
+            poly.point_data[f"abs_dist_{name}"] = abs_distances[i]
+            poly.point_data[f"rel_dist_{name}"] = rel_distances[i]
         # Add t values
         poly.point_data["t"] = np.concatenate(
             [
@@ -120,80 +130,61 @@ class AirfoilViz:
             poly.point_data["rel_span"] = np.full(len(all_points), self.rel_span)
         return poly
 
-    def _add_normals(self, poly, all_points, web_info):
+    def _add_normals(self, poly, all_points, web_info, web_ends):
         """Add normal vectors to point data."""
-        normals_point = []
-        for i in range(len(all_points)):
-            if i < len(self.current_points):
-                # Airfoil point
-                t = self.current_t[i]
-                dx = self.spline_x.derivative()(t)
-                dy = self.spline_y.derivative()(t)
-                dz = self.spline_z.derivative()(t)
-                tangent = np.array([dx, dy, dz])
-                # Normal in xy plane
-                normal = np.array([-tangent[1], tangent[0], 0])
-                normal = (
-                    normal / np.linalg.norm(normal)
-                    if np.linalg.norm(normal) > 0
-                    else np.array([0, 0, 1])
-                )
-                normals_point.append(normal)
-            else:
-                # Web point - compute normal in plane of mesh
-                # Find which web this point belongs to
-                web_idx = 0
-                i - len(self.current_points)
-                for sw_idx, (sw, start_idx, n_points_web) in enumerate(web_info):
-                    if start_idx <= i < start_idx + n_points_web:
-                        web_idx = sw_idx
-                        break
-                sw = self.shear_webs[web_idx]
-                t1, t2 = sw.compute_intersections(self)
-                p1 = self.get_points([t1])[0]
-                p2 = self.get_points([t2])[0]
-                direction = p2 - p1
-                dx, dy, dz = direction
-                normal = np.array([-dy, dx, 0])
-                norm = np.linalg.norm(normal)
-                if norm > 0:
-                    normal /= norm
-                else:
-                    normal = np.array([0, 0, 1])
-                normals_point.append(normal)
-        poly.point_data["Normals"] = np.array(normals_point)
+        # Airfoil points, normal in xy plane from the tangents at all t at once,
+        # found in the spline frame and then rotated with the airfoil
+        normals = _unit_normals(self.spline_deriv(self.current_t))
+        normals = normals @ self._rotation_matrix().T
+        # Web points, normal in plane of mesh from each web's direction
+        direction = web_ends[:, 1] - web_ends[:, 0]
+        n_points_web = [n for _, _, n in web_info]
+        web_normals = _unit_normals(np.repeat(direction, n_points_web, axis=0))
+        poly.point_data["Normals"] = np.vstack([normals, web_normals])
         return poly
 
     def to_pyvista(self):
         """Export to PyVista PolyData (line mesh)."""
         self.logger.debug("Exporting to PyVista")
-        all_points, web_w, web_info = self._create_pyvista_mesh()
+        all_points, web_w, web_info, web_ends = self._create_pyvista_mesh()
         poly = self._create_lines_and_cells(all_points, web_info)
         poly = self._add_point_data(poly, all_points, web_w, web_info)
-        poly = self._add_normals(poly, all_points, web_info)
+        poly = self._add_normals(poly, all_points, web_info, web_ends)
         self.logger.debug(
-            f"PyVista mesh created with {poly.n_points} points and {poly.n_cells} cells"
+            "PyVista mesh created with %d points and %d cells",
+            poly.n_points,
+            poly.n_cells,
         )
         return poly
 
     def plot(self, show_hard_points=False, save_path=None, show=True):
-        """Plot the airfoil using Matplotlib."""
+        """Plot the airfoil using Matplotlib.
+
+        Set B3_MSH_HEADLESS to render with the non-interactive Agg backend.
+        """
         self.logger.debug("Plotting airfoil")
-        plt.figure()  # Create a new figure to avoid overlapping
+        # Imported here so meshing without plotting does not pay for pyplot
+        import matplotlib
+
+        if os.environ.get("B3_MSH_HEADLESS"):
+            matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+        from matplotlib.collections import LineCollection
+
+        fig = plt.figure()  # Create a new figure to avoid overlapping
         points = self.current_points
         plt.plot(points[:, 0], points[:, 1], "b-", alpha=0.5)
-        # Plot shear webs
-        for sw in self.shear_webs:
-            t1, t2 = sw.compute_intersections(self)
-            p1 = self.get_points([t1])[0]
-            p2 = self.get_points([t2])[0]
-            n_elements = self.shear_web_n_elements[sw]
-            n_points_web = n_elements + 1
-            web_points = np.linspace(p1, p2, n_points_web)
-            plt.plot(web_points[:, 0], web_points[:, 1], "g-", alpha=0.5, linewidth=2)
+        # Plot shear webs, all lines as one collection and markers in one call
+        n_points = [self.shear_web_n_elements[sw] + 1 for sw in self.shear_webs]
+        web_points = _web_points(self._web_ends(), n_points)[0][:, :2]
+        if n_points:
+            web_segments = np.split(web_points, np.cumsum(n_points)[:-1])
+            plt.gca().add_collection(
+                LineCollection(web_segments, colors="g", alpha=0.5, linewidths=2)
+            )
             plt.plot(web_points[:, 0], web_points[:, 1], "g.", markersize=4)
         # Plot non-hard points with .
-        non_hard_mask = ~np.isin(self.current_t, self.hard_points)
+        non_hard_mask = ~self._hard_mask
         plt.plot(points[non_hard_mask, 0], points[non_hard_mask, 1], "k.", markersize=2)
         plt.axis("equal")
         plt.xlabel("x")
@@ -201,20 +192,22 @@ class AirfoilViz:
         plt.title("Airfoil Mesh")
         plt.grid(True)
         if show_hard_points:
-            hard_points_pos = self.get_points(self.hard_points)
+            hard_points = self._hp_sorted
+            hard_points_pos = self.get_points(hard_points)
             plt.plot(hard_points_pos[:, 0], hard_points_pos[:, 1], "ro", markersize=8)
             for i, (x, y, _) in enumerate(hard_points_pos):
                 plt.text(
                     x,
                     y + 0.01,
-                    f"t={self.hard_points[i]:.2f}",
+                    f"t={hard_points[i]:.2f}",
                     fontsize=8,
                     ha="center",
                     va="bottom",
                 )
         if save_path:
-            plt.savefig(save_path)
-            self.logger.info(f"Plot saved to {save_path}")
-        if show and save_path is None:
+            fig.savefig(save_path)
+            plt.close(fig)  # Release the figure once it is saved
+            self.logger.info("Plot saved to %s", save_path)
+        elif show:
             plt.show()
         self.logger.debug("Plotting complete")
@@ -1,25 +1,83 @@
 """Core functionality for processing blade sections."""
 
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
 import numpy as np
+import pyvista as pv
 from .airfoil import Airfoil
 from .shear_web import ShearWeb
+from ..utils.logger import get_logger
+
+# Binary VTK XML output with LZ4 compression, which writes and reads faster
+# than both the default zlib and uncompressed output
+SAVE_OPTIONS = {"binary": True, "compression": "lz4"}
+
+
+def section_indices(mesh, z_values):
+    """Get the t-sorted point indices of each z section with a single sort."""
+    z_col = mesh.points[:, 2]
+    t_col = mesh.point_data["t"]
+    # Sort by z, then by t, so every section is a contiguous, t-ordered run
+    order = np.lexsort((t_col, z_col))
+    z_sorted = z_col[order]
+    # Query all sections against the sorted column at once
+    z_values = np.asarray(z_values, dtype=float)
+    eps = 1e-8 + 1e-5 * np.abs(z_values)  # Same tolerance as np.isclose
+    lows = np.searchsorted(z_sorted, z_values - eps, side="left")
+    highs = np.searchsorted(z_sorted, z_values + eps, side="right")
+    sections = []
+    for lo, hi in zip(lows, highs):
+        idx = order[lo:hi]
+        if hi > lo and z_sorted[lo] != z_sorted[hi - 1]:
+            # Several distinct z values within tolerance, re-sort the run by t
+            idx = idx[np.argsort(t_col[idx], kind="stable")]
+        sections.append(idx)
+    return sections
+
+
+def is_constant(values, rtol=1e-5, atol=1e-8):
+    """Check if all values are close to the first, with np.allclose tolerances.
+
+    Compares the range of the values rather than each value against the first,
+    which needs no temporary array. The range is at least the largest
+    deviation from the first value, so the check is never looser.
+    """
+    values = np.asarray(values)
+    if values.shape[0] <= 1:
+        return True
+    return bool(np.all(np.ptp(values, axis=0) <= atol + rtol * np.abs(values[0])))
 
 
-def process_section_from_mesh(mesh, z, chordwise_mesh, webs_config, logger):
-    """Process a single section mesh by remeshing with uniform t distribution."""
-    # Extract points at this z
-    mask = np.isclose(mesh.points[:, 2], z)
+def process_section_from_mesh(
+    mesh, z, chordwise_mesh, webs_config, logger, indices=None
+):
+    """Process a single section mesh by remeshing with uniform t distribution.
 
-    section_points = mesh.points[mask]
-    # Sort by associated t pointdata
-    t_values = mesh.point_data["t"][mask]
-    sorted_indices = np.argsort(t_values)
-    sorted_points = section_points[sorted_indices]
-    points_2d = sorted_points[:, :2]  # Take x,y
+    If given, ``indices`` are the t-sorted point indices of the section (see
+    ``section_indices``) and the scan over all mesh points is skipped.
+    """
+    if indices is None:
+        # Extract points at this z, sorted by associated t pointdata
+        mask = np.isclose(mesh.points[:, 2], z)
+        indices = np.flatnonzero(mask)[np.argsort(mesh.point_data["t"][mask])]
+    points_2d = mesh.points[indices, :2]  # Take x,y
+    point_data = {
+        field: mesh.point_data[field][indices] for field in mesh.point_data.keys()
+    }
+    return process_section(
+        points_2d, z, point_data, chordwise_mesh, webs_config, logger
+    )
 
-    # Get rel_span from mesh
-    rel_span_values = mesh.point_data["rel_span"][mask]
-    rel_span = rel_span_values[0]  # All points at same z have same rel_span
+
+def process_section(points_2d, z, point_data, chordwise_mesh, webs_config, logger):
+    """Process a section given its t-sorted x,y points and point data arrays.
+
+    Only plain arrays are passed in, so this is cheap to dispatch to a
+    worker process.
+    """
+    # Get rel_span from point data
+    rel_span = point_data["rel_span"][0]  # All points at same z have same rel_span
 
     # Create Airfoil from points
     af = Airfoil(points_2d, is_normalized=False, position=(0, 0, z))  # Position at z
@@ -27,34 +85,142 @@ def process_section_from_mesh(mesh, z, chordwise_mesh, webs_config, logger):
 
     # Add constant fields from input mesh
     af.constant_fields = {}
-    for field in mesh.point_data.keys():
-        values = mesh.point_data[field][mask]
-        if np.allclose(values, values[0]):
+    for field, values in point_data.items():
+        if is_constant(values):
             af.constant_fields[field] = values[0]
 
-    # Add shear webs if applicable
-    for web in webs_config:
-        if web["mesh"]:
-            z_range = web["z_range"]
-            if z_range[0] <= z <= z_range[1]:
-                sw_def = {
-                    "type": web["type"],
-                    "origin": [web["origin"][0], web["origin"][1], z],
-                    "normal": web["orientation"],
-                    "name": web["name"],
-                }
-                sw = ShearWeb(sw_def)
-                af.add_shear_web(sw, n_elements=10)  # Default n_elements
-                logger.debug(f"Added shear web {web['name']} at z={z}")
-
-    # Add trailing edge shear web
-    sw_te = ShearWeb({"type": "trailing_edge", "name": "trailing_edge"})
-    af.add_shear_web(sw_te, n_elements=5)
-    logger.debug(f"Added trailing edge shear web at z={z}")
-
-    # Remesh with uniform t distribution
+    # Add all shear webs, then remesh once with uniform t distribution
     n_elem = chordwise_mesh["default"]["n_elem"]
-    logger.debug(f"Remeshing with {n_elem} elements")
-    af.remesh(total_n_points=n_elem + 1)
+    with af.deferred_remesh(total_n_points=n_elem + 1):
+        # Add shear webs if applicable
+        for web in webs_config:
+            if web["mesh"]:
+                z_range = web["z_range"]
+                if z_range[0] <= z <= z_range[1]:
+                    sw_def = {
+                        "type": web["type"],
+                        "origin": [web["origin"][0], web["origin"][1], z],
+                        "normal": web["orientation"],
+                        "name": web["name"],
+                    }
+                    sw = ShearWeb(sw_def)
+                    af.add_shear_web(sw, n_elements=10)  # Default n_elements
+                    logger.debug("Added shear web %s at z=%s", web["name"], z)
+
+        # Add trailing edge shear web
+        sw_te = ShearWeb({"type": "trailing_edge", "name": "trailing_edge"})
+        af.add_shear_web(sw_te, n_elements=5)
+        logger.debug("Added trailing edge shear web at z=%s", z)
+    logger.debug("Remeshed with %d elements", n_elem)
 
     return af
+
+
+# Logger of the section workers, set once per worker process by _init_worker
+_worker_logger = None
+
+
+def _init_worker(logger_name, level):
+    """Set up the logger of a worker process, with the caller's name and level."""
+    global _worker_logger
+    _worker_logger = get_logger(logger_name)
+    _worker_logger.setLevel(level)
+
+
+def _process_one(section):
+    """Process one pre-sliced section; runs in a worker process."""
+    return process_section(*section, _worker_logger)
+
+
+def process_sections(
+    mesh, z_sections, chordwise_mesh, webs_config, logger, max_workers=None
+):
+    """Process all sections of mesh, in parallel over worker processes.
+
+    Webs are given as dicts, as in the YAML config. The sections are returned
+    in the order of ``z_sections``, and the workers log through a logger of the
+    same name and level as ``logger``. With ``max_workers=1``, or a single
+    section, the sections are processed serially in this process.
+    """
+    # Fetch the arrays from VTK once, rather than once per section
+    points = np.asarray(mesh.points)
+    point_data = {
+        field: np.asarray(mesh.point_data[field]) for field in mesh.point_data.keys()
+    }
+    # Meshed webs within range of each section, for all sections at once
+    meshed = [web for web in webs_config if web["mesh"]]
+    z_range = np.array([web["z_range"] for web in meshed], dtype=float).reshape(-1, 2)
+    z_col = np.asarray(z_sections, dtype=float)[:, None]
+    active = (z_range[:, 0] <= z_col) & (z_col <= z_range[:, 1])
+    # Sort the points by (z, t) once and slice each section from it, so the
+    # workers only receive small arrays rather than the full mesh
+    section_args = [
+        (
+            points[idx, :2],
+            z,
+            {field: values[idx] for field, values in point_data.items()},
+            chordwise_mesh,
+            [meshed[j] for j in np.flatnonzero(active[i])],
+        )
+        for i, (z, idx) in enumerate(zip(z_sections, section_indices(mesh, z_sections)))
+    ]
+    if max_workers == 1 or len(section_args) <= 1:
+        return [process_section(*section, logger) for section in section_args]
+    with ProcessPoolExecutor(
+        max_workers=max_workers or os.cpu_count(),
+        initializer=_init_worker,
+        initargs=(logger.name, logger.getEffectiveLevel()),
+    ) as executor:
+        return list(executor.map(_process_one, section_args))
+
+
+def section_meshes(sections):
+    """Convert all sections to PyVista meshes concurrently, in section order."""
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        return list(executor.map(lambda af: af.to_pyvista(), sections))
+
+
+def add_cell_averages(mesh):
+    """Add the average of each point array over every line as cell data.
+
+    Same as point_data_to_cell_data(pass_point_data=True) for 2-point lines,
+    without a VTK filter run per mesh.
+    """
+    ends = mesh.lines.reshape(-1, 3)[:, 1:]
+    for key in mesh.point_data.keys():
+        values = mesh.point_data[key]
+        mesh.cell_data[key] = (values[ends[:, 0]] + values[ends[:, 1]]) / 2
+    return mesh
+
+
+def merge_line_meshes(meshes):
+    """Merge line meshes into one PolyData, as pv.merge does.
+
+    Exactly coincident points are joined into their first occurrence, points
+    keep their input order, and only arrays present in every mesh are kept.
+    """
+    points = np.vstack([mesh.points for mesh in meshes])
+    offsets = np.cumsum([0] + [mesh.n_points for mesh in meshes[:-1]])
+    ends = np.vstack(
+        [
+            mesh.lines.reshape(-1, 3)[:, 1:] + offset
+            for mesh, offset in zip(meshes, offsets)
+        ]
+    )
+    _, first, inverse = np.unique(
+        points, axis=0, return_index=True, return_inverse=True
+    )
+    keep = np.sort(first)  # First occurrence of each distinct point
+    new_index = np.empty(len(points), dtype=np.int64)
+    new_index[keep] = np.arange(len(keep))
+    ends = new_index[first[inverse.ravel()]][ends]
+    lines = np.column_stack([np.full(len(ends), 2), ends]).ravel()
+    poly = pv.PolyData(points[keep], lines=lines)
+    for kind in ("point_data", "cell_data"):
+        for key in getattr(meshes[0], kind).keys():
+            if all(key in getattr(mesh, kind) for mesh in meshes):
+                values = np.concatenate([getattr(mesh, kind)[key] for mesh in meshes])
+                getattr(poly, kind)[key] = (
+                    values[keep] if kind == "point_data" else values
+                )
+    return poly
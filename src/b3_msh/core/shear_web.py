@@ -5,6 +5,12 @@ import numpy as np
 from scipy.optimize import brentq
 from ..utils.logger import get_logger
 
+# Plane webs: root tolerance in t, far below any mesh spacing
+_PLANE_XTOL = 1e-10
+# Line webs: grid points for the closest point search, then refinement steps
+_LINE_GRID_SIZE = 513
+_LINE_NEWTON_STEPS = 4
+
 
 class ShearWeb:
     """Represents a shear web defined by a plane, line,
@@ -16,7 +22,7 @@ class ShearWeb:
         self.logger.debug("Initializing ShearWeb")
         self.definition = definition
         self.name = None  # Set in add_shear_web
-        self.logger.debug(f"ShearWeb definition: {definition}")
+        self.logger.debug("ShearWeb definition: %s", definition)
 
     def compute_intersections(self, airfoil):
         """Compute t values where the shear web intersects the airfoil spline."""
@@ -28,25 +34,46 @@ class ShearWeb:
         elif self.definition["type"] == "trailing_edge":
             result = 0.0, 1.0  # Corrected to return leading to trailing edge
         else:
-            self.logger.error(f"Unsupported shear web type: {self.definition['type']}")
+            self.logger.error("Unsupported shear web type: %s", self.definition["type"])
             raise ValueError("Unsupported shear web type")
-        self.logger.debug(f"Intersections: {result}")
+        self.logger.debug("Intersections: %s", result)
         return result
 
+    def _local_definition(self, airfoil):
+        """Get the web definition in the airfoil's untransformed frame.
+
+        Returns the plane normal and offset, or the line point and direction,
+        such that they apply directly to the airfoil's spline points.
+        """
+        rot_matrix = airfoil._rotation_matrix()
+        if self.definition["type"] == "plane":
+            origin = np.array(self.definition["origin"], dtype=float)
+            normal = np.array(self.definition["normal"], dtype=float)
+            # (chord * R p + position - origin) . n = 0  <=>  p . R^T n = c
+            offset = np.dot(origin - airfoil.position, normal) / airfoil.chord
+            values = np.append(rot_matrix.T @ normal, offset)
+        else:
+            point = np.array(self.definition["point"], dtype=float)
+            direction = np.array(self.definition["direction"], dtype=float)
+            local_point = rot_matrix.T @ (point - airfoil.position) / airfoil.chord
+            values = np.concatenate([local_point, rot_matrix.T @ direction])
+        return values
+
     def _intersect_plane(self, airfoil):
         """Find t where spline intersects plane using root-finding."""
         self.logger.debug("Intersecting with plane")
-        origin = np.array(self.definition["origin"])
-        normal = np.array(self.definition["normal"])
+        # Plane in the spline frame, so f needs no transform per evaluation
+        values = self._local_definition(airfoil)
+        normal, offset = values[:3], values[3]
+        spline = airfoil.spline
 
         def f(t):
-            point = airfoil.get_points([t])[0]
-            return np.dot(point - origin, normal)
+            return spline(t) @ normal - offset
 
         # Assume two intersections; find roots in [0,0.5] and [0.5,1]
         try:
-            t1 = brentq(f, 0, 0.5)
-            t2 = brentq(f, 0.5, 1)
+            t1 = brentq(f, 0, 0.5, xtol=_PLANE_XTOL, rtol=_PLANE_XTOL)
+            t2 = brentq(f, 0.5, 1, xtol=_PLANE_XTOL, rtol=_PLANE_XTOL)
             return t1, t2
         except ValueError:
             self.logger.error("Plane does not intersect airfoil at two points")
@@ -56,18 +83,35 @@ class ShearWeb:
         """Find t where spline is closest to line (approximate intersection)."""
         self.logger.debug("Intersecting with line")
         # For simplicity, minimize distance; assumes 2D or 3D line
-        point = np.array(self.definition["point"])
-        direction = np.array(self.definition["direction"])
-
-        def dist(t):
-            spline_pt = airfoil.get_points([t])[0]
-            vec = spline_pt - point
-            proj = np.dot(vec, direction) / np.dot(direction, direction)
-            return np.linalg.norm(vec - proj * direction)
+        # Line in the spline frame, distances are scaled by 1 / chord
+        values = self._local_definition(airfoil)
+        point, direction = values[:3], values[3:]
+        unit = direction / np.linalg.norm(direction)
 
-        # Find two minima (rough approximation for two intersections)
-        from scipy.optimize import minimize_scalar
+        def perp(vec):
+            """Component of each row of vec perpendicular to the line."""
+            return vec - np.outer(vec @ unit, unit)
 
-        res1 = minimize_scalar(dist, bounds=(0, 0.5), method="bounded")
-        res2 = minimize_scalar(dist, bounds=(0.5, 1), method="bounded")
-        return res1.x, res2.x
+        # Squared distance to the line on a dense grid, vectorized
+        ts = np.linspace(0, 1, _LINE_GRID_SIZE)
+        d2 = np.sum(perp(airfoil.spline(ts) - point) ** 2, axis=1)
+        half = _LINE_GRID_SIZE // 2  # ts[half] == 0.5
+        result = []
+        for lo, hi, window in (
+            (0.0, 0.5, slice(0, half + 1)),
+            (0.5, 1.0, slice(half, None)),
+        ):
+            t = ts[window][np.argmin(d2[window])]
+            # Refine the closest grid point with Gauss-Newton steps on d2(t)
+            for _ in range(_LINE_NEWTON_STEPS):
+                residual = perp(airfoil.spline([t]) - point)[0]
+                slope = perp(airfoil.spline_deriv([t]))[0]
+                curvature = slope @ slope
+                if curvature == 0:
+                    break
+                t_new = min(max(t - (residual @ slope) / curvature, lo), hi)
+                if t_new == t:
+                    break
+                t = t_new
+            result.append(float(t))
+        return tuple(result)
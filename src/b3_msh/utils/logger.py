@@ -1,13 +1,16 @@
 """Get a configured logger for the given name."""
 
 import logging
-from rich.logging import RichHandler
 
 
 def get_logger(name):
     """Get a configured logger for the given name."""
     logger = logging.getLogger(name)
     if not logger.handlers:
+        # Imported on first use, as rich.logging takes about as long to import
+        # as numpy
+        from rich.logging import RichHandler
+
         handler = RichHandler(rich_tracebacks=True, markup=True, show_time=False)
         logger.setLevel(logging.INFO)  # Default level changed to INFO for output
         logger.addHandler(handler)
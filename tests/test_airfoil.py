@@ -1,5 +1,11 @@
+import copy
+from unittest.mock import patch
+
 import numpy as np
 from b3_msh.core.airfoil import Airfoil
+from b3_msh.core.airfoil_core import _read_xfoil
+from b3_msh.core.airfoil_mesh import _resample_panels
+from b3_msh.core.airfoil_viz import _unit_normals, _web_points
 from b3_msh.utils.utils import process_airfoils_parallel
 
 
@@ -29,6 +35,26 @@ def test_from_xfoil():
     assert len(af.current_points) > 10  # Should have points
 
 
+def test_from_xfoil_cached():
+    """Test that repeated XFOIL loads reuse the parsed file."""
+    _read_xfoil.cache_clear()
+    af1 = Airfoil.from_xfoil("tests/data/naca0018.dat")
+    af2 = Airfoil.from_xfoil("tests/data/naca0018.dat")
+    assert _read_xfoil.cache_info().hits == 1
+    assert np.array_equal(af1.original_points, af2.original_points)
+    af2.rotate(10)
+    assert not np.allclose(af1.current_points, af2.current_points)
+
+
+def test_init_copies_writeable_points():
+    """Test that writeable input points are copied and read-only ones shared."""
+    points = np.array([[0, 0, 0], [0.5, 0.1, 0], [1, 0, 0]], dtype=float)
+    af = Airfoil(points)
+    points[1, 1] = 5
+    assert af.original_points[1, 1] == 0.1
+    assert Airfoil(af.original_points).original_points is af.original_points
+
+
 def test_rotate():
     """Test rotating the airfoil."""
     points = np.array([[0, 0], [0.5, 0.1], [1, 0]])
@@ -49,6 +75,29 @@ def test_translate():
     assert np.allclose(af.position, [1, 2, 3])
 
 
+def test_apply_transform():
+    """Test updating the transform without re-evaluating the spline."""
+    af = Airfoil.from_xfoil("tests/data/naca0018.dat")
+    af.chord = 2.0
+    af.position = np.array([1.0, 2.0, 3.0])
+    af.rotation = 15
+    af.apply_transform()
+    assert np.allclose(af.current_points, af.get_points(af.current_t))
+
+
+def test_deepcopy():
+    """Test that copies share the base points but not the transform state."""
+    af = Airfoil.from_xfoil("tests/data/naca0018.dat")
+    af_copy = copy.deepcopy(af)
+    assert af_copy.original_points is af.original_points
+    assert not af_copy.original_points.flags.writeable
+    af_copy.translate(1, 0, 0)
+    af_copy.add_hard_point(0.4)
+    assert np.allclose(af.position, [0, 0, 0])
+    assert 0.4 not in af.hard_points
+    assert len(af_copy.current_points) == len(af.current_points) + 1
+
+
 def test_remesh():
     """Test remeshing."""
     points = np.array([[0, 0], [0.5, 0.1], [1, 0]])
@@ -91,6 +140,16 @@ def test_remesh_n_elements_per_panel():
         assert n_cells_panel == n_elem
 
 
+def test_resample_panels_matches_linspace():
+    """Test the vectorized panel resampling against per-panel linspace."""
+    edges = np.array([0.0, 0.3, 0.35, 1.0])
+    n_points = np.array([11, 1, 7])
+    expected = np.concatenate(
+        [np.linspace(a, b, n) for a, b, n in zip(edges[:-1], edges[1:], n_points)]
+    )
+    assert np.array_equal(_resample_panels(edges[:-1], edges[1:], n_points), expected)
+
+
 def test_hard_points():
     """Test adding hard points."""
     points = np.array([[0, 0], [0.5, 0.1], [1, 0]])
@@ -99,6 +158,38 @@ def test_hard_points():
     assert 0.5 in af.hard_points
 
 
+def test_hard_points_near_duplicate():
+    """Test that hard points within round-off of an existing one are skipped."""
+    points = np.array([[0, 0], [0.5, 0.1], [1, 0]])
+    af = Airfoil(points)
+    af.add_hard_point(0.5)
+    af.add_hard_point(0.5 + 1e-14)
+    af.add_hard_point(1 - 1e-14)
+    assert af.hard_points == (0.0, 0.5, 1.0)
+
+
+def test_deferred_remesh():
+    """Test that deferred hard points are meshed once on exit."""
+    af = Airfoil.from_xfoil("tests/data/naca0018.dat")
+    with af.deferred_remesh(total_n_points=51):
+        af.add_hard_point(0.3)
+        af.add_hard_point(0.7)
+    assert 0.3 in af.current_t and 0.7 in af.current_t
+    assert len(af.current_t) == 51
+
+
+def test_lazy_remesh():
+    """Test that adding hard points remeshes once, on next use of the mesh."""
+    af = Airfoil.from_xfoil("tests/data/naca0018.dat")
+    with patch.object(af, "remesh", wraps=af.remesh) as remesh:
+        af.add_hard_point(0.3)
+        af.add_hard_point(0.7)
+        assert remesh.call_count == 0
+        assert 0.3 in af.current_t and 0.7 in af.current_t
+        assert len(af.current_points) == len(af.current_t)
+        assert remesh.call_count == 1
+
+
 def test_panels():
     """Test getting panels."""
     points = np.array([[0, 0], [0.5, 0.1], [1, 0]])
@@ -122,6 +213,35 @@ def test_to_pyvista():
     assert "t" in mesh.point_data
 
 
+def test_unit_normals():
+    """Test xy-plane normals, with +z for tangents along z."""
+    tangents = np.array([[2.0, 0, 0], [0, 0, 1.0]])
+    assert np.allclose(_unit_normals(tangents), [[0, 1, 0], [0, 0, 1]])
+
+
+def test_web_points_match_linspace():
+    """Test the vectorized web points against per-web linspace."""
+    web_ends = np.array([[[0, 0, 0], [0.3, 1, 0]], [[1, 2, 3], [-1, 0.1, 3]]])
+    n_points = [11, 4]
+    points, w = _web_points(web_ends, n_points)
+    expected = np.vstack(
+        [np.linspace(p1, p2, n) for (p1, p2), n in zip(web_ends, n_points)]
+    )
+    assert np.allclose(points, expected)
+    assert np.array_equal(points[[0, 10, 11, 14]], web_ends.reshape(-1, 3))
+    assert np.allclose(w, np.concatenate([np.linspace(0, 1, n) for n in n_points]))
+
+
+def test_normals_rotate_with_airfoil():
+    """Test that airfoil normals follow the airfoil rotation."""
+    points = np.array([[0, 0], [0.5, 0.1], [1, 0]])
+    normals = Airfoil(points).to_pyvista().point_data["Normals"]
+    rotated = Airfoil(points, rotation=90).to_pyvista().point_data["Normals"]
+    # Rotating by 90 degrees about z maps (x, y) to (-y, x)
+    assert np.allclose(rotated[:, 0], -normals[:, 1])
+    assert np.allclose(rotated[:, 1], normals[:, 0])
+
+
 def test_plot_show_hard_points():
     """Test plotting with hard points shown."""
     points = np.array([[0, 0], [0.5, 0.1], [1, 0]])
@@ -131,6 +251,18 @@ def test_plot_show_hard_points():
     af.plot(show_hard_points=True, show=False)
 
 
+def test_plot_no_show_keeps_figure_open():
+    """Test that plot(show=False) leaves the figure open for the caller."""
+    import matplotlib.pyplot as plt
+
+    plt.close("all")
+    af = Airfoil(np.array([[0, 0], [0.5, 0.1], [1, 0]]))
+    af.plot(show=False)
+    assert plt.get_fignums() == [1]
+    assert len(plt.gca().lines) > 0
+    plt.close("all")
+
+
 def test_process_parallel():
     """Test parallel processing of airfoils."""
     points = np.array([[0, 0], [0.5, 0.1], [1, 0]])
@@ -151,3 +283,12 @@ def test_named_hard_points():
     assert "abs_dist_t0" in mesh.point_data
     assert "abs_dist_t1" in mesh.point_data
     assert "abs_dist_mid" in mesh.point_data
+
+
+def test_hard_points_immutable():
+    """Test that hard points are exposed as a sorted tuple."""
+    points = np.array([[0, 0], [0.5, 0.1], [1, 0]])
+    af = Airfoil(points)
+    af.add_hard_point(0.7)
+    af.add_hard_point(0.3)
+    assert af.hard_points == (0.0, 0.3, 0.7, 1.0)
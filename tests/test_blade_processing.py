@@ -1,6 +1,16 @@
 import numpy as np
-from unittest.mock import Mock
-from b3_msh.core.blade_processing import process_section_from_mesh
+import pyvista as pv
+from unittest.mock import Mock, patch
+from b3_msh.core.airfoil import Airfoil
+from b3_msh.core.blade_processing import (
+    add_cell_averages,
+    is_constant,
+    merge_line_meshes,
+    process_section_from_mesh,
+    process_sections,
+    section_indices,
+)
+from b3_msh.core.shear_web import ShearWeb
 from b3_msh.utils.logger import get_logger
 
 
@@ -146,3 +156,132 @@ def test_process_section_from_mesh_no_mesh_flag():
     assert af.rel_span == 0.0
     assert len(af.shear_webs) == 1  # only trailing edge
     assert af.constant_fields == {"rel_span": 0.0}
+
+
+def test_section_indices_matches_mask():
+    """Test that sorted section indices match the per-z mask extraction."""
+    points = np.array(
+        [
+            [1, 0, 1],
+            [0, 0, 0],
+            [0.5, 0.1, 1],
+            [1, 0, 0],
+            [0, 0, 1],
+            [0.5, 0.1, 0],
+        ]
+    )
+    t_values = np.array([1, 0, 0.5, 1, 0, 0.5])
+    rel_span_values = np.array([1.0, 0.0, 1.0, 0.0, 1.0, 0.0])
+    mock_mesh = Mock()
+    mock_mesh.points = points
+    mock_mesh.point_data = {"t": t_values, "rel_span": rel_span_values}
+
+    idx0, idx1 = section_indices(mock_mesh, [0.0, 1.0])
+    assert list(idx0) == [1, 5, 3]
+    assert list(idx1) == [4, 2, 0]
+
+    logger = get_logger(__name__)
+    chordwise_mesh = {"default": {"n_elem": 10}}
+    af_mask = process_section_from_mesh(mock_mesh, 1.0, chordwise_mesh, [], logger)
+    af_idx = process_section_from_mesh(
+        mock_mesh, 1.0, chordwise_mesh, [], logger, indices=idx1
+    )
+    assert np.allclose(af_mask.current_points, af_idx.current_points)
+    assert af_idx.rel_span == 1.0
+
+
+def test_process_sections_matches_single_sections():
+    """Test that parallel section processing filters webs and keeps z order."""
+    points = np.array(
+        [[0, 0, 0], [0.5, 0.1, 0], [1, 0, 0], [0, 0, 1], [0.5, 0.1, 1], [1, 0, 1]]
+    )
+    mock_mesh = Mock()
+    mock_mesh.points = points
+    mock_mesh.point_data = {
+        "t": np.array([0, 0.5, 1, 0, 0.5, 1]),
+        "rel_span": np.array([0.0, 0.0, 0.0, 1.0, 1.0, 1.0]),
+    }
+    web = {
+        "name": "web",
+        "type": "plane",
+        "origin": [0.5, 0],
+        "orientation": [1, 0, 0],
+        "z_range": [0.5, 2.0],
+        "mesh": True,
+    }
+    logger = get_logger(__name__)
+    chordwise_mesh = {"default": {"n_elem": 10}}
+    sections = process_sections(mock_mesh, [1.0, 0.0], chordwise_mesh, [web], logger)
+    assert [af.rel_span for af in sections] == [1.0, 0.0]
+    assert [len(af.shear_webs) for af in sections] == [2, 1]  # With trailing edge
+    for z, af in zip([1.0, 0.0], sections):
+        expected = process_section_from_mesh(
+            mock_mesh, z, chordwise_mesh, [web], logger
+        )
+        assert np.allclose(af.current_points, expected.current_points)
+
+
+def test_process_sections_serial_without_pool():
+    """Test that one worker, or a single section, skips the process pool."""
+    mock_mesh = Mock()
+    mock_mesh.points = np.array(
+        [[0, 0, 0], [0.5, 0.1, 0], [1, 0, 0], [0, 0, 1], [0.5, 0.1, 1], [1, 0, 1]]
+    )
+    mock_mesh.point_data = {
+        "t": np.array([0, 0.5, 1, 0, 0.5, 1]),
+        "rel_span": np.array([0.0, 0.0, 0.0, 1.0, 1.0, 1.0]),
+    }
+    logger = get_logger(__name__)
+    chordwise_mesh = {"default": {"n_elem": 10}}
+    with patch(
+        "b3_msh.core.blade_processing.ProcessPoolExecutor",
+        side_effect=AssertionError("process pool started"),
+    ):
+        sections = process_sections(
+            mock_mesh, [1.0, 0.0], chordwise_mesh, [], logger, max_workers=1
+        )
+        single = process_sections(mock_mesh, [0.0], chordwise_mesh, [], logger)
+    assert [af.rel_span for af in sections] == [1.0, 0.0]
+    assert np.allclose(single[0].current_points, sections[1].current_points)
+
+
+def test_merge_line_meshes_matches_pv_merge():
+    """Test that merged sections match pv.merge, including joined web points."""
+    meshes = []
+    for z in (0.0, 1.0):
+        af = Airfoil.from_xfoil("tests/data/naca0018.dat", position=(0, 0, z))
+        sw = ShearWeb({"type": "plane", "origin": (0.5, 0, z), "normal": (1, 0, 0)})
+        af.add_shear_web(sw, n_elements=4)
+        meshes.append(af.to_pyvista())
+    merged = merge_line_meshes(meshes)
+    expected = pv.merge(meshes)
+    assert merged.n_points < sum(mesh.n_points for mesh in meshes)
+    assert np.array_equal(merged.points, expected.points)
+    assert np.array_equal(merged.lines, expected.lines)
+    for key in expected.point_data.keys():
+        assert np.array_equal(
+            merged.point_data[key], expected.point_data[key], equal_nan=True
+        )
+    assert np.array_equal(merged.cell_data["panel_id"], expected.cell_data["panel_id"])
+
+
+def test_is_constant():
+    """Test the constant field check against np.allclose."""
+    assert is_constant(np.full(5, 0.3))
+    assert is_constant(np.array([1.0, 1.0 + 1e-9, 1.0]))
+    assert not is_constant(np.array([0.0, 0.1, 0.0]))
+    assert not is_constant(np.array([0.0, np.nan]))
+    assert is_constant(np.array([[0.0, 1.0], [0.0, 1.0]]))
+    assert not is_constant(np.array([[0.0, 1.0], [0.0, 2.0]]))
+
+
+def test_add_cell_averages_matches_vtk():
+    """Test that line cell averages match point_data_to_cell_data."""
+    af = Airfoil.from_xfoil("tests/data/naca0018.dat")
+    af.add_shear_web(
+        ShearWeb({"type": "plane", "origin": (0.5, 0, 0), "normal": (1, 0, 0)})
+    )
+    expected = af.to_pyvista().point_data_to_cell_data(pass_point_data=True)
+    mesh = add_cell_averages(af.to_pyvista())
+    for key in expected.cell_data.keys():
+        np.testing.assert_allclose(mesh.cell_data[key], expected.cell_data[key])
@@ -0,0 +1,44 @@
+import os
+import numpy as np
+import pytest
+import pyvista as pv
+from b3_msh.cli import commands
+from b3_msh.cli.commands import remesh
+from b3_msh.core.airfoil import Airfoil
+
+
+@pytest.mark.parametrize("ext", [".txt", ".npy", ".npz"])
+def test_remesh_saves_points(tmp_path, ext):
+    """Test the remesh command for each output format, reading the file back."""
+    output = tmp_path / f"remeshed{ext}"
+    remesh("tests/data/naca0018.dat", str(output), n_points=50)
+    if ext == ".npy":
+        points = np.load(output)
+    elif ext == ".npz":
+        points = np.load(output)["points"]
+    else:
+        points = np.loadtxt(output, skiprows=1)  # Skip "x y" header
+    af = Airfoil.from_xfoil("tests/data/naca0018.dat")
+    af.remesh(total_n_points=50)
+    assert points.shape == (50, 2)
+    assert np.allclose(points, af.current_points[:, :2], atol=1e-7)  # %.8g text
+
+
+def test_cached_rereads_modified_files_and_copies(tmp_path):
+    """Test that the file cache re-reads changed files and hands out copies."""
+    config = tmp_path / "config.yml"
+    config.write_text("mesh:\n  z: [0.0, 1.0]\n")
+    first = commands._cached(config, commands._load_config)
+    first["mesh"]["z"].append(2.0)  # In-place edit, as the statesman step does
+    assert commands._cached(config, commands._load_config)["mesh"]["z"] == [0, 1]
+    config.write_text("mesh:\n  z: [3.0]\n")
+    mtime = os.stat(config).st_mtime_ns + 10**9  # Changed even on coarse clocks
+    os.utime(config, ns=(mtime, mtime))
+    assert commands._cached(config, commands._load_config)["mesh"]["z"] == [3.0]
+
+    mesh_path = tmp_path / "mesh.vtp"
+    pv.Line(resolution=2).save(mesh_path)
+    mesh = commands._cached(mesh_path, pv.read)
+    mesh.points[0] = [9, 9, 9]
+    assert np.allclose(commands._cached(mesh_path, pv.read).points[0], [-0.5, 0, 0])
+    assert len(commands._FILE_CACHE) <= commands._FILE_CACHE_SIZE
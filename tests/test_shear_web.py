@@ -1,4 +1,5 @@
 import numpy as np
+from unittest.mock import patch
 from b3_msh.core.airfoil import Airfoil
 from b3_msh.core.shear_web import ShearWeb
 
@@ -84,3 +85,39 @@ def test_shear_web_named():
     mesh = af.to_pyvista()
     assert "abs_dist_test_web_hp0" in mesh.point_data
     assert "abs_dist_test_web_hp1" in mesh.point_data
+
+
+def test_shear_web_intersections_scale_invariant():
+    """Test that scaling and moving airfoil and web together keeps t."""
+    points = np.array([[0, 0], [0.5, 0.1], [1, 0]])
+    af1 = Airfoil(points)
+    af2 = Airfoil(points, chord=2.0, position=(1, 0, 0))
+    sw1 = ShearWeb({"type": "plane", "origin": (0.5, 0.05, 0), "normal": (0, 1, 0)})
+    # Same plane relative to the scaled and translated second airfoil
+    sw2 = ShearWeb({"type": "plane", "origin": (2.0, 0.1, 0), "normal": (0, 1, 0)})
+    assert np.allclose(sw2.compute_intersections(af2), sw1.compute_intersections(af1))
+
+
+def test_shear_web_intersections_cached_per_airfoil():
+    """Test that an airfoil computes each web's intersections once per transform."""
+    af = Airfoil.from_xfoil("tests/data/naca0018.dat")
+    sw = ShearWeb({"type": "plane", "origin": (0.5, 0, 0), "normal": (1, 0, 0)})
+    with patch.object(sw, "compute_intersections", wraps=sw.compute_intersections):
+        af.add_shear_web(sw)
+        af.to_pyvista()
+        af.plot(show=False)
+        assert sw.compute_intersections.call_count == 1
+        af.translate(0, 0, 1)
+        af.to_pyvista()
+        assert sw.compute_intersections.call_count == 2
+
+
+def test_shear_web_line_on_line():
+    """Test that line intersections lie on the line for a transformed airfoil."""
+    af = Airfoil.from_xfoil(
+        "tests/data/naca0018.dat", chord=2.0, position=(1, 0.1, 0), rotation=20
+    )
+    sw = ShearWeb({"type": "line", "point": (1.5, 0.2, 0), "direction": (0, 1, 0)})
+    t1, t2 = sw.compute_intersections(af)
+    assert t1 < 0.5 < t2
+    np.testing.assert_allclose(af.get_points([t1, t2])[:, 0], 1.5, atol=1e-9)
@@ -1,6 +1,22 @@
 import numpy as np
+import numpy.testing as npt
+import pytest
+import pyvista as pv
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
 from unittest.mock import Mock, patch
 from b3_msh.statesman.statesman_step import B3MshStep
+from b3_msh.utils.logger import get_logger
+
+MODULE = "b3_msh.statesman.statesman_step"
+PROCESSING = "b3_msh.core.blade_processing"
+# Input mesh points, two sections of three points at z=0 and z=1
+POINTS = np.array(
+    [[0, 0, 0], [1, 0, 0], [0.5, 0.1, 0], [0, 0, 1], [1, 0, 1], [0.5, 0.1, 1]],
+    dtype=float,
+)
+T_VALUES = np.array([0, 0.5, 1, 0, 0.5, 1], dtype=float)
+DEPENDENT_SECTIONS = frozenset({"geometry", "airfoils", "structure", "mesh"})
 
 
 def test_b3msh_step_attributes():
@@ -10,20 +26,13 @@ def test_b3msh_step_attributes():
     assert B3MshStep.input_files[0].name == "b3_geo/lm1_mesh.vtp"
     assert B3MshStep.input_files[0].non_empty
     assert B3MshStep.output_files == ["b3_msh/lm2.vtp"]
-    assert set(B3MshStep.dependent_sections) == {
-        "geometry",
-        "airfoils",
-        "structure",
-        "mesh",
-    }
+    assert frozenset(B3MshStep.dependent_sections) == DEPENDENT_SECTIONS
 
 
-def test_b3msh_step_execute():
-    """Test B3MshStep _execute method with mocked dependencies."""
-    step = object.__new__(B3MshStep)
-    step.config_path = "/tmp/config.yml"
-    # Mock config
-    mock_config = {
+@pytest.fixture
+def mock_config():
+    """Minimal step config; function scoped, as _execute expands mesh.z in place."""
+    return {
         "workdir": "/tmp/test",
         "geometry": {
             "planform": {
@@ -45,39 +54,57 @@ def test_b3msh_step_execute():
             "chordwise": {"default": {"n_elem": 10}, "panels": []},
         },
     }
+
+
+@pytest.fixture
+def mock_mesh():
+    """Two-section input mesh; function scoped, as tests assert on its calls."""
+    # Specced on PolyData, so the step can only use attributes a real mesh has
+    mesh = Mock(spec=pv.PolyData)
+    mesh.points = POINTS
+    mesh.point_data = {"t": T_VALUES}
+    mesh.cell_data = {}
+    mesh.lines = np.array([], dtype=int)
+    return mesh
+
+
+def test_b3msh_step_execute(mock_config, mock_mesh):
+    """Test B3MshStep _execute method with mocked dependencies."""
+    step = object.__new__(B3MshStep)
+    step.config_path = "/tmp/config.yml"
     step.config = mock_config
-    # Mock logger
-    step.logger = Mock()
-    # Mock mesh
-    mock_mesh = Mock()
-    mock_mesh.points = np.array(
-        [[0, 0, 0], [1, 0, 0], [0.5, 0.1, 0], [0, 0, 1], [1, 0, 1], [0.5, 0.1, 1]]
-    )
-    mock_mesh.point_data = {"t": np.array([0, 0.5, 1, 0, 0.5, 1])}
-    mock_mesh.cell_data = {}
-    mock_mesh.lines = np.array([], dtype=int)
-    mock_mesh.point_data_to_cell_data = Mock(return_value=mock_mesh)
-    mock_mesh.save = Mock()
+    # Real logger, as the section workers look it up by name
+    step.logger = get_logger("B3MshStep")
     mock_af = Mock()
     mock_af.to_pyvista = Mock(return_value=mock_mesh)
-    step.process_section_from_mesh = Mock(return_value=mock_af)
-    # Mock pv.read
-    with patch(
-        "b3_msh.statesman.statesman_step.pv.read", return_value=mock_mesh
-    ) as mock_read, patch(
-        "b3_msh.statesman.statesman_step.pv.MultiBlock"
-    ) as mock_multiblock, patch("pathlib.Path.exists", return_value=True), patch(
-        "b3_msh.statesman.statesman_step.pv.merge", return_value=mock_mesh
-    ) as mock_merge, patch(
-        "b3_msh.statesman.statesman_step.pv.PolyData.save", Mock()
-    ) as mock_poly_save:
-        mock_mb_instance = Mock()
-        mock_multiblock.return_value = mock_mb_instance
+    # Mock pv.read, and process sections in threads so the mocks apply
+    with ExitStack() as stack:
+        stack.enter_context(
+            patch(f"{PROCESSING}.ProcessPoolExecutor", ThreadPoolExecutor)
+        )
+        stack.enter_context(patch("pathlib.Path.exists", return_value=True))
+        mock_process = stack.enter_context(
+            patch(f"{PROCESSING}.process_section", return_value=mock_af)
+        )
+        mock_read = stack.enter_context(
+            patch(f"{MODULE}.pv.read", return_value=mock_mesh)
+        )
+        mock_merge = stack.enter_context(
+            patch(f"{MODULE}.merge_line_meshes", return_value=mock_mesh)
+        )
         # Call _execute
         step._execute()
         # Check that read was called
         mock_read.assert_called_once()
+        # Check that each z section was processed with its t-sorted points
+        assert mock_process.call_count == 2
+        calls = sorted(mock_process.call_args_list, key=lambda c: c.args[1])
+        for call, z in zip(calls, [0.0, 1.0]):
+            points_2d, section_z, point_data = call.args[:3]
+            assert section_z == z
+            npt.assert_array_equal(points_2d, [[0, 0], [1, 0], [0.5, 0.1]])
+            npt.assert_array_equal(point_data["t"], [0, 0.5, 1])
         # Check that merge was called
         mock_merge.assert_called_once()
-        # Check that poly save was called
-        mock_poly_save.assert_called_once()
+        # Check that the merged mesh was saved
+        mock_mesh.save.assert_called_once()